@@ -1,33 +1,84 @@
+import gzip
 import hashlib
-import json
 import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 from datetime import date, datetime
+from email.utils import formatdate, parsedate
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from io import BytesIO
 import shutil
 
-from fastapi import Depends, FastAPI, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
+import anyio
+import anyio.to_thread
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi import Path as PathParam
+from fastapi.responses import FileResponse, HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
+from pydantic import TypeAdapter
+from pydantic_core import from_json, to_json
+from sqlalchemy import case, delete, event, exists, func, insert, inspect, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.sql import column, table
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from PIL import Image
 from docx import Document
-from openpyxl import Workbook, load_workbook
+import xlsxwriter
+from openpyxl import load_workbook
 from pptx import Presentation
 from pptx.util import Inches
 
 from .config import get_workspace_path, set_workspace_path
 from . import models, schemas
-from .database import Base, SessionLocal, engine
+from .database import (
+    MAX_OVERFLOW,
+    POOL_SIZE,
+    PROJECT_SEARCH_TABLE,
+    Base,
+    SessionLocal,
+    add_missing_columns,
+    add_missing_indexes,
+    engine,
+    ensure_project_search_index,
+)
 from .logging_utils import setup_logging
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Haier Project Tracker API")
+_project_search_index = False
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _project_search_index
+    # Sync handlers each hold a pooled connection; let the threadpool grow to the pool size but not past it.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = POOL_SIZE + MAX_OVERFLOW
+    # Schema bootstrap runs once per process; set HPT_SKIP_DDL=1 when the schema is managed externally.
+    skip_ddl = bool(os.environ.get("HPT_SKIP_DDL"))
+    if not skip_ddl:
+        Base.metadata.create_all(bind=engine)
+        if add_missing_columns():
+            # Databases from older builds get the stored progress columns filled in once.
+            _backfill_progress()
+        add_missing_indexes()
+    _project_search_index = ensure_project_search_index(create=not skip_ddl)
+    yield
+
+
+app = FastAPI(title="Haier Project Tracker API", lifespan=lifespan)
 
 LOGGER = setup_logging(get_workspace_path() / "logs")
 
@@ -36,20 +87,32 @@ if DIST_DIR.exists():
     app.mount("/app", StaticFiles(directory=DIST_DIR, html=True), name="spa")
     app.mount("/assets", StaticFiles(directory=DIST_DIR / "assets"), name="assets")
 
+    def _read_spa_index() -> tuple[bytes, str]:
+        body = (DIST_DIR / "index.html").read_bytes()
+        return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+    _cached_spa_index = lru_cache(maxsize=1)(_read_spa_index)
+
+    def _spa_index_response(request: Request) -> Response:
+        # HPT_SPA_DEV=1 re-reads index.html on every request, for a dist/ that is being rebuilt.
+        body, etag = _read_spa_index() if os.environ.get("HPT_SPA_DEV") else _cached_spa_index()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(body, headers=headers)
+
     @app.get("/")
-    def serve_spa_root():
-        return FileResponse(DIST_DIR / "index.html")
+    def serve_spa_root(request: Request):
+        return _spa_index_response(request)
 
     @app.get("/app/", response_class=HTMLResponse)
-    def serve_spa_index():
-        return (DIST_DIR / "index.html").read_text(encoding="utf-8")
+    def serve_spa_index(request: Request):
+        return _spa_index_response(request)
 
     @app.get("/cache-admin.html", response_class=HTMLResponse)
-    def serve_cache_admin():
-        cache_page = DIST_DIR / "cache-admin.html"
-        if not cache_page.exists():
-            raise HTTPException(status_code=404, detail="Cache admin page not found")
-        return cache_page.read_text(encoding="utf-8")
+    def serve_cache_admin(request: Request):
+        # Sent from disk (sendfile where the server supports it) with ETag/304 handling.
+        return _file_response(DIST_DIR / "cache-admin.html", request, media_type="text/html")
 
 
 def get_db():
@@ -60,11 +123,114 @@ def get_db():
         db.close()
 
 
+def _exists(db: Session, condition) -> bool:
+    """SELECT EXISTS(...) for checks that only need to know whether a row is there."""
+    return db.query(exists().where(condition)).scalar()
+
+
+def _update_returning(db: Session, model, row_id: int, fields: dict):
+    """UPDATE ... RETURNING for PATCH handlers; returns the updated row or None if it does not exist.
+
+    ORM-enabled UPDATE statements skip the flush hooks, so callers that change progress
+    inputs must call ``_refresh_progress`` themselves.
+    """
+    if not fields:
+        return db.get(model, row_id)
+    return db.scalar(update(model).where(model.id == row_id).values(**fields).returning(model))
+
+
+_LOOKUP_CACHE_TTL = 15.0
+_GZIP_MIN_SIZE = 500
+_CATEGORY_LIST = TypeAdapter(list[schemas.Category])
+_PM_LIST = TypeAdapter(list[schemas.PM])
+
+
+@dataclass(frozen=True)
+class _CachedBody:
+    created: float
+    body: bytes
+    etag: str
+    gzipped: Optional[bytes]
+
+
+_lookup_cache: dict[str, _CachedBody] = {}
+_lookup_cache_lock = threading.Lock()
+_lookup_cache_generation = 0
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_lookup_cache(session: Session) -> None:
+    global _lookup_cache_generation
+    with _lookup_cache_lock:
+        _lookup_cache_generation += 1
+        _lookup_cache.clear()
+
+
+def _cached_lookup(key: str, loader) -> _CachedBody:
+    """Return the cached JSON body for ``key``, building it with ``loader`` on a miss.
+
+    Any commit invalidates the cache.
+    """
+    with _lookup_cache_lock:
+        entry = _lookup_cache.get(key)
+        if entry is not None and time.monotonic() - entry.created < _LOOKUP_CACHE_TTL:
+            return entry
+        generation = _lookup_cache_generation
+    # Load outside the lock; a commit that lands meanwhile bumps the generation and drops the result.
+    body = loader()
+    entry = _CachedBody(
+        created=time.monotonic(),
+        body=body,
+        etag=hashlib.blake2b(body, digest_size=8).hexdigest(),
+        gzipped=gzip.compress(body) if len(body) >= _GZIP_MIN_SIZE else None,
+    )
+    with _lookup_cache_lock:
+        if generation == _lookup_cache_generation:
+            _lookup_cache[key] = entry
+    return entry
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (``gzip;q=0`` refuses it)."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def _cached_json_response(request: Request, key: str, loader) -> Response:
+    entry = _cached_lookup(key, loader)
+    use_gzip = entry.gzipped is not None and _accepts_gzip(request.headers.get("accept-encoding", ""))
+    # Each encoding is a separate representation and needs its own strong ETag.
+    etag = f'"{entry.etag}-gzip"' if use_gzip else f'"{entry.etag}"'
+    # no-cache: clients must revalidate, so edits made in the SPA show up on the next fetch.
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.gzipped, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=16)
+def _ensure_dir(path: Path) -> Path:
+    """Create ``path`` once per process; keyed by full path, so a new workspace gets its own."""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def _media_root() -> Path:
-    workspace = get_workspace_path()
-    media_root = workspace / "media"
-    media_root.mkdir(parents=True, exist_ok=True)
-    return media_root
+    return _ensure_dir(get_workspace_path() / "media")
 
 
 def _resolve_workspace_file(path: str) -> Path:
@@ -75,14 +241,50 @@ def _resolve_workspace_file(path: str) -> Path:
         target.relative_to(workspace)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid file path")
-    if not target.exists() or not target.is_file():
-        raise HTTPException(status_code=404, detail="File not found")
     return target
 
 
-@app.get("/health")
-def healthcheck():
-    return {"status": "ok"}
+def _is_not_modified(request: Request, etag: str, last_modified: Optional[str] = None) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since the way StaticFiles does for its responses."""
+    if if_none_match := request.headers.get("if-none-match"):
+        if if_none_match.strip() == "*":
+            return True
+        return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if last_modified is not None and (if_modified_since := request.headers.get("if-modified-since")):
+        since = parsedate(if_modified_since)
+        modified = parsedate(last_modified)
+        return since is not None and modified is not None and modified <= since
+    return False
+
+
+def _file_response(path: Path, request: Optional[Request] = None, **kwargs) -> Response:
+    """FileResponse for an existing regular file, reusing this function's stat() result.
+
+    With ``request`` given, a matching conditional GET gets an empty 304 instead of the file.
+    """
+    try:
+        stat_result = path.stat()
+    except OSError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+    response = FileResponse(path, stat_result=stat_result, **kwargs)
+    if request is not None:
+        etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+        if _is_not_modified(request, etag, last_modified):
+            headers = {"ETag": etag, "Last-Modified": last_modified}
+            if "cache-control" in response.headers:
+                headers["Cache-Control"] = response.headers["cache-control"]
+            return Response(status_code=304, headers=headers)
+    return response
+
+
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
+@app.api_route("/health", methods=["GET", "HEAD"])
+async def healthcheck():
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/workspace", response_model=schemas.WorkspaceState)
@@ -100,38 +302,54 @@ def update_workspace(payload: schemas.WorkspaceUpdate):
 
 
 @app.get("/updates/manifest", response_model=schemas.UpdateManifest)
-def get_update_manifest():
+def get_update_manifest(request: Request):
     workspace = get_workspace_path()
     manifest_path = workspace / "updates" / "manifest.json"
-    if not manifest_path.exists():
+    try:
+        data = manifest_path.read_bytes()
+        modified = manifest_path.stat().st_mtime
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Update manifest not found")
+    # Updaters poll this endpoint; an unchanged manifest is answered with an empty 304.
+    headers = {
+        "ETag": f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"',
+        "Last-Modified": formatdate(modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _is_not_modified(request, headers["ETag"], headers["Last-Modified"]):
+        return Response(status_code=304, headers=headers)
     try:
-        data = manifest_path.read_text(encoding="utf-8")
-        return schemas.UpdateManifest.parse_raw(data)
+        manifest = schemas.UpdateManifest.model_validate_json(data)
     except ValueError:
         raise HTTPException(status_code=400, detail="Manifest file is not valid JSON")
+    return Response(content=manifest.model_dump_json(), media_type="application/json", headers=headers)
 
 
 @app.post("/updates/manifest", response_model=schemas.UpdateManifest)
 def set_update_manifest(manifest: schemas.UpdateManifest):
-    workspace = get_workspace_path()
-    updates_dir = workspace / "updates"
-    updates_dir.mkdir(parents=True, exist_ok=True)
+    updates_dir = _ensure_dir(get_workspace_path() / "updates")
     manifest_path = updates_dir / "manifest.json"
-    manifest_path.write_text(manifest.json(ensure_ascii=False, indent=2), encoding="utf-8")
+    # model_dump_json writes non-ASCII text as-is, like json.dumps(..., ensure_ascii=False).
+    manifest_path.write_text(manifest.model_dump_json(indent=2), encoding="utf-8")
     LOGGER.info("Update manifest saved to %s", manifest_path)
     return manifest
 
 
-@app.post("/updates/package")
-def upload_update_package(file: UploadFile = File(...)):
-    workspace = get_workspace_path()
-    updates_dir = workspace / "updates"
-    updates_dir.mkdir(parents=True, exist_ok=True)
+# 1 MiB keeps each read large enough for hashlib to release the GIL while staying cache-friendly.
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+@app.post("/updates/package", response_model=schemas.UpdatePackageInfo)
+async def upload_update_package(file: UploadFile = File(...)):
+    updates_dir = _ensure_dir(get_workspace_path() / "updates")
     dest = updates_dir / file.filename
-    with dest.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    digest = hashlib.sha256(dest.read_bytes()).hexdigest()
+    hasher = hashlib.sha256()
+    # Async I/O keeps large uploads from holding a threadpool slot, which is sized for DB work.
+    async with await anyio.open_file(dest, "wb") as buffer:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
     LOGGER.info("Uploaded update package to %s (sha256=%s)", dest, digest)
     return {
         "filename": file.filename,
@@ -141,26 +359,23 @@ def upload_update_package(file: UploadFile = File(...)):
 
 
 @app.get("/updates/download/{filename}")
-def download_update_package(filename: str):
+def download_update_package(filename: str, request: Request):
     workspace = get_workspace_path()
-    file_path = workspace / "updates" / filename
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+    # Servers advertising the ASGI pathsend extension get the path and send it with sendfile.
+    return _file_response(workspace / "updates" / filename, request)
 
 
 @app.get("/files/{file_path:path}")
-def serve_workspace_file(file_path: str):
+def serve_workspace_file(file_path: str, request: Request):
     """Expose files stored under the current workspace (covers, media, attachments)."""
     target = _resolve_workspace_file(file_path)
-    return FileResponse(target, headers={"Cache-Control": "no-store"})
+    # Revalidate on every use rather than caching for a fixed time: a deleted attachment can be
+    # re-uploaded under the same name, and the mtime/size ETag then changes with it.
+    return _file_response(target, request, headers={"Cache-Control": "no-cache"})
 
 
 def _cache_root() -> Path:
-    workspace = get_workspace_path()
-    cache_root = workspace / "cache"
-    cache_root.mkdir(parents=True, exist_ok=True)
-    return cache_root
+    return _ensure_dir(get_workspace_path() / "cache")
 
 
 def _cache_meta_path() -> Path:
@@ -168,89 +383,212 @@ def _cache_meta_path() -> Path:
 
 
 def _read_cache_meta() -> dict:
-    meta_path = _cache_meta_path()
-    if meta_path.exists():
-        try:
-            return json.loads(meta_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return {}
-    return {}
+    try:
+        return from_json(_cache_meta_path().read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
 
 
 def _write_cache_meta(data: dict) -> None:
     meta_path = _cache_meta_path()
     meta_path.parent.mkdir(parents=True, exist_ok=True)
-    meta_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    meta_path.write_bytes(to_json(data, indent=2))
+
+
+_MEDIA_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+@dataclass(frozen=True)
+class _MediaDirListing:
+    mtime_ns: int
+    media: list[Path]
+    subdirs: list[str]
+
+
+# Per-directory listings from the last walk. A directory's mtime changes whenever an entry is
+# added, removed or renamed in it, so unchanged directories are reused with a single stat().
+_media_dir_index: dict[str, _MediaDirListing] = {}
+_media_dir_index_lock = threading.Lock()
 
+# FAT/exFAT (and some network mounts) keep mtimes in 2 s steps, so an entry added in the same step
+# as the last listing leaves the mtime as it was. Directories modified this recently are not cached.
+_MEDIA_DIR_MTIME_RESOLUTION = 2.0
 
-def _iter_media_files():
-    media_root = _media_root()
-    if not media_root.exists():
-        return []
-    return [
-        path
-        for path in media_root.rglob("*")
-        if path.is_file() and path.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+def _forget_media_dirs(directory: str, keep: list[str]) -> None:
+    """Drop cached listings below ``directory`` except those of ``keep`` subdirectories and their trees.
+
+    Call with ``_media_dir_index_lock`` held.
+    """
+    prefix = os.path.join(directory, "")
+    kept = tuple(os.path.join(subdir, "") for subdir in keep)
+    stale = [
+        key
+        for key in _media_dir_index
+        if key.startswith(prefix) and not os.path.join(key, "").startswith(kept)
     ]
+    for key in stale:
+        del _media_dir_index[key]
+
+
+def _drop_media_dir(directory: str) -> list[Path]:
+    with _media_dir_index_lock:
+        _media_dir_index.pop(directory, None)
+        _forget_media_dirs(directory, [])
+    return []
+
+
+def _list_media_dir(directory: str) -> list[Path]:
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return _drop_media_dir(directory)
+    with _media_dir_index_lock:
+        listing = _media_dir_index.get(directory)
+    if listing is None or listing.mtime_ns != mtime_ns:
+        media: list[Path] = []
+        subdirs: list[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in _MEDIA_SUFFIXES:
+                        media.append(Path(entry.path))
+        except OSError:
+            # Removed between the stat() and the scan.
+            return _drop_media_dir(directory)
+        listing = _MediaDirListing(mtime_ns, media, subdirs)
+        with _media_dir_index_lock:
+            # Subdirectories that were removed or renamed are never visited again; evict their listings.
+            _forget_media_dirs(directory, subdirs)
+            if time.time() - mtime_ns / 1e9 >= _MEDIA_DIR_MTIME_RESOLUTION:
+                _media_dir_index[directory] = listing
+            else:
+                _media_dir_index.pop(directory, None)
+    files = list(listing.media)
+    for subdir in listing.subdirs:
+        files.extend(_list_media_dir(subdir))
+    return files
+
+
+def _walk_entries(root: Path) -> Iterator[os.DirEntry]:
+    """Every entry under ``root``, like ``rglob("*")``, as ``os.DirEntry`` objects.
+
+    ``DirEntry.is_file()``/``is_dir()`` answer from the directory listing on Windows and on
+    filesystems that report entry types. A missing root yields nothing.
+    """
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+
+def _iter_media_files() -> list[Path]:
+    return _list_media_dir(str(_media_root()))
+
+
+# Pillow releases the GIL while decoding, resizing and encoding, so threads scale across cores
+# without the spawn/pickling cost of a process pool (and without freeze_support in the desktop build).
+_THUMBNAIL_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _thumbnail_path(src: Path, workspace: Path, thumb_root: Path) -> Path:
+    """PNG sources keep their name; every other format is thumbnailed to ``<stem>.jpg``."""
+    dest = thumb_root / src.relative_to(workspace)
+    return dest if dest.suffix.lower() == ".png" else dest.with_suffix(".jpg")
+
+
+def _thumbnail_one(src: Path, dest_file: Path, max_size: tuple[int, int]) -> str:
+    """Write the thumbnail for one media file; returns "created", "skipped" or a failure message."""
+    format_name = "PNG" if dest_file.suffix.lower() == ".png" else "JPEG"
+    if dest_file.exists() and dest_file.stat().st_mtime >= src.stat().st_mtime:
+        return "skipped"
+    dest_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with Image.open(src) as img:
+            # JPEG shrink-on-load: libjpeg decodes at 1/2, 1/4 or 1/8 scale, keeping at least twice
+            # the target size (Pillow's default reducing_gap). Must run before convert() loads pixels.
+            img.draft("RGB", (max_size[0] * 2, max_size[1] * 2))
+            img = img.convert("RGB")
+            img.thumbnail(max_size)
+            if format_name == "JPEG":
+                # Single-pass encode with standard Huffman tables: optimize=True roughly doubles the
+                # encode time for a small size saving on files that are only served locally.
+                img.save(dest_file, format="JPEG", quality=85, subsampling="4:2:0")
+            else:
+                img.save(dest_file, format=format_name, optimize=True)
+    except Exception as exc:  # pragma: no cover - defensive log
+        return f"{src.name}: {exc}"
+    return "created"
 
 
 def _build_thumbnails(max_size: tuple[int, int] = (512, 512)) -> dict:
     media_files = _iter_media_files()
-    cache_root = _cache_root()
-    thumb_root = cache_root / "thumbnails"
-    created = 0
-    skipped = 0
-    failures: list[str] = []
-    for src in media_files:
-        rel = src.relative_to(get_workspace_path())
-        dest = thumb_root / rel
-        dest_suffix = dest.suffix.lower() or ".jpg"
-        format_name = "PNG" if dest_suffix == ".png" else "JPEG"
-        dest_file = dest.with_suffix(".jpg" if format_name == "JPEG" else dest.suffix)
-        if dest_file.exists() and dest_file.stat().st_mtime >= src.stat().st_mtime:
-            skipped += 1
-            continue
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with Image.open(src) as img:
-                img = img.convert("RGB")
-                img.thumbnail(max_size)
-                img.save(dest_file, format=format_name, optimize=True, quality=85)
-                created += 1
-        except Exception as exc:  # pragma: no cover - defensive log
-            failures.append(f"{src.name}: {exc}")
+    workspace = get_workspace_path()
+    thumb_root = _cache_root() / "thumbnails"
+    # a.jpg, a.jpeg, a.bmp and a.webp share one thumbnail. One task per destination keeps two workers
+    # from writing the same file; as with a sequential run, the last source listed wins.
+    tasks = {_thumbnail_path(src, workspace, thumb_root): src for src in media_files}
+    with ThreadPoolExecutor(max_workers=_THUMBNAIL_WORKERS) as pool:
+        results = list(pool.map(lambda task: _thumbnail_one(task[1], task[0], max_size), tasks.items()))
+    created = results.count("created")
+    skipped = results.count("skipped") + len(media_files) - len(tasks)
+    failures = [result for result in results if result not in ("created", "skipped")]
     meta = _read_cache_meta()
     meta["last_thumbnail_run"] = datetime.utcnow().isoformat() + "Z"
     _write_cache_meta(meta)
     return {"processed": len(media_files), "created": created, "skipped": skipped, "failures": failures}
 
 
+def _prewarm_file(path: str) -> None:
+    if hasattr(os, "posix_fadvise"):
+        # Ask the kernel to read the whole file into the page cache in the background;
+        # nothing is copied into the process.
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+        return
+    # Windows has no fadvise: touching the first block still primes the file metadata and head.
+    with open(path, "rb") as handle:
+        handle.read(1024)
+
+
 def _prewarm_cache() -> dict:
-    files = list(_media_root().rglob("*"))
+    total = 0
     touched = 0
-    for path in files:
-        if not path.is_file():
+    for entry in _walk_entries(_media_root()):
+        total += 1
+        if not entry.is_file():
             continue
         try:
-            with path.open("rb") as handle:
-                handle.read(1024)
+            _prewarm_file(entry.path)
             touched += 1
         except OSError:
             continue
     meta = _read_cache_meta()
     meta["last_prewarm"] = datetime.utcnow().isoformat() + "Z"
     _write_cache_meta(meta)
-    return {"files_touched": touched, "total_items": len(files)}
+    return {"files_touched": touched, "total_items": total}
 
 
 def _cache_status() -> dict:
     media_files = _iter_media_files()
     thumb_root = _cache_root() / "thumbnails"
-    thumbnails = list(thumb_root.rglob("*")) if thumb_root.exists() else []
+    thumbnails = sum(1 for entry in _walk_entries(thumb_root) if entry.is_file())
     meta = _read_cache_meta()
     return {
         "media_files": len(media_files),
-        "thumbnails": len([p for p in thumbnails if p.is_file()]),
+        "thumbnails": thumbnails,
         "last_thumbnail_run": meta.get("last_thumbnail_run"),
         "last_prewarm": meta.get("last_prewarm"),
     }
@@ -281,27 +619,20 @@ def cache_clear():
     cache_root.mkdir(parents=True, exist_ok=True)
 
 
-def _status_value(status: str, inprogress_coeff: float) -> float:
-    mapping = {
-        "done": 1.0,
-        "in_progress": inprogress_coeff,
-        "blocked": 0.0,
-        "todo": 0.0,
-    }
-    return mapping.get(status, 0.0)
+def _status_values(inprogress_coeff: float) -> dict[str, float]:
+    # "blocked", "todo" and unknown statuses count as 0.
+    return {"done": 1.0, "in_progress": inprogress_coeff}
 
 
 def _compute_step_progress(step: models.Step, inprogress_coeff: float) -> int:
+    status_values = _status_values(inprogress_coeff)
     if step.subtasks:
         total_weight = sum(subtask.weight for subtask in step.subtasks)
         if total_weight == 0:
             return 0
-        value = sum(
-            _status_value(subtask.status, inprogress_coeff) * subtask.weight
-            for subtask in step.subtasks
-        )
+        value = sum(status_values.get(subtask.status, 0.0) * subtask.weight for subtask in step.subtasks)
         return round((value / total_weight) * 100)
-    return round(_status_value(step.status, inprogress_coeff) * 100)
+    return round(status_values.get(step.status, 0.0) * 100)
 
 
 def _apply_progress(project: models.Project) -> models.Project:
@@ -338,11 +669,111 @@ def _apply_progress(project: models.Project) -> models.Project:
     return project
 
 
-def _apply_category_metrics(category: models.Category, db: Session) -> models.Category:
-    projects = [
+def _refresh_progress(db: Session, project_ids) -> None:
+    """Recompute and store the progress columns of the given projects and their steps."""
+    if not project_ids:
+        return
+    projects = (
+        db.query(models.Project)
+        .options(selectinload(models.Project.steps).selectinload(models.Step.subtasks))
+        .filter(models.Project.id.in_(project_ids))
+        .populate_existing()
+        .all()
+    )
+    for project in projects:
         _apply_progress(project)
-        for project in category.projects
-    ]
+
+
+_BACKFILL_BATCH_SIZE = 100
+
+
+def _backfill_progress() -> None:
+    """Compute the stored progress of every project, a batch of projects per session and commit.
+
+    Keeps memory and the ``IN (...)`` parameter count bounded however large the database is.
+    """
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            project_ids = db.scalars(
+                select(models.Project.id)
+                .where(models.Project.id > last_id)
+                .order_by(models.Project.id)
+                .limit(_BACKFILL_BATCH_SIZE)
+            ).all()
+            if not project_ids:
+                return
+            _refresh_progress(db, project_ids)
+            db.commit()
+        last_id = project_ids[-1]
+
+
+# Attributes that feed into the stored progress; edits to anything else leave it untouched.
+_PROGRESS_INPUTS = {
+    models.Project: ("inprogress_coeff",),
+    models.Step: ("status", "weight"),
+    models.Subtask: ("status", "weight"),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_progress_changes(session: Session, flush_context, instances) -> None:
+    changed = session.info.setdefault("progress_changed", [])
+    # Each access to session.new / session.dirty rebuilds the set from the identity map; read them once.
+    new, dirty = session.new, session.dirty
+    for obj in (*new, *dirty, *session.deleted):
+        inputs = _PROGRESS_INPUTS.get(type(obj))
+        if inputs is None:
+            continue
+        if obj in new and isinstance(obj, models.Project):
+            continue  # starts at 0; any steps added with it are picked up on their own
+        if obj in dirty:
+            state = inspect(obj)
+            if not any(state.attrs[name].history.has_changes() for name in inputs):
+                continue
+        changed.append(obj)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _store_changed_progress(session: Session, flush_context) -> None:
+    changed = session.info.pop("progress_changed", None)
+    if not changed:
+        return
+    # Ids are read after the flush so that freshly inserted rows have them.
+    project_ids = {obj.id for obj in changed if isinstance(obj, models.Project)}
+    project_ids.update(obj.project_id for obj in changed if isinstance(obj, models.Step))
+    step_ids = {obj.step_id for obj in changed if isinstance(obj, models.Subtask)}
+    if step_ids:
+        project_ids.update(
+            project_id
+            for (project_id,) in session.query(models.Step.project_id).filter(models.Step.id.in_(step_ids))
+        )
+    # The recomputed columns are written by the next flush, which commit() runs on its own.
+    _refresh_progress(session, project_ids)
+
+
+def _raise_on_lazy_load(orm_execute_state) -> None:
+    """Dev/CI guard: a relationship lazy load in a handler is an N+1 query waiting to happen."""
+    if not orm_execute_state.is_relationship_load:
+        return
+    state = orm_execute_state.lazy_loaded_from
+    if state is None:
+        return
+    # Session.refresh() of a relationship also goes through the lazy loader, but is asked for explicitly.
+    # The marker is a SQLAlchemy internal; test_lazy_load_guard pins it.
+    if "sa_top_level_orm_context" in orm_execute_state.execution_options:
+        return
+    raise InvalidRequestError(
+        f"Lazy load from {state.class_.__name__} (id={state.identity}); add a selectinload() option"
+    )
+
+
+if os.environ.get("HPT_RAISE_ON_LAZY_LOAD"):
+    event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+
+
+def _apply_category_metrics(category: models.Category, kpi: schemas.KPIReport) -> models.Category:
+    projects = category.projects
     if projects:
         category.progress_percent = round(
             sum(project.progress_percent for project in projects) / len(projects)
@@ -350,16 +781,43 @@ def _apply_category_metrics(category: models.Category, db: Session) -> models.Ca
     else:
         category.progress_percent = 0
     category.average_progress = category.progress_percent
-    category.kpi = _kpi_report(db, category.id)
+    category.kpi = kpi
     return category
 
 
-def _workbook_response(wb: Workbook, filename: str) -> StreamingResponse:
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
+_EXPORT_CHUNK_SIZE = 1 << 16
+# Finished exports up to this size stay in memory; bigger ones spill to a temp file.
+_EXPORT_SPOOL_SIZE = 8 << 20
+
+
+def _iter_and_close(handle, chunk_size: int = _EXPORT_CHUNK_SIZE):
+    """Stream a rewound file object in fixed-size chunks (iterating it directly splits on newlines)."""
+    try:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+    finally:
+        handle.close()
+
+
+def _workbook_response(sheets: dict[str, Iterable[list]], filename: str) -> StreamingResponse:
+    """Write plain value rows per sheet; exports carry no styling, so xlsxwriter's row writer is enough.
+
+    constant_memory flushes each row to a temp file as soon as the next one starts, so only the
+    current row is held in memory; rows must therefore be written strictly top to bottom.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=_EXPORT_SPOOL_SIZE)
+    wb = xlsxwriter.Workbook(
+        output,
+        {"constant_memory": True, "default_date_format": "yyyy-mm-dd", "strings_to_urls": False},
+    )
+    for title, rows in sheets.items():
+        sheet = wb.add_worksheet(title)
+        for index, row in enumerate(rows):
+            sheet.write_row(index, 0, row)
+    wb.close()
+    output.seek(0)
     return StreamingResponse(
-        buffer,
+        _iter_and_close(output),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -368,91 +826,78 @@ def _workbook_response(wb: Workbook, filename: str) -> StreamingResponse:
 def _binary_response(buffer: BytesIO, media_type: str, filename: str) -> StreamingResponse:
     buffer.seek(0)
     return StreamingResponse(
-        buffer,
+        _iter_and_close(buffer),
         media_type=media_type,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
+_EXPORT_YIELD_PER = 1000
+
+
 def _export_categories_excel(db: Session) -> StreamingResponse:
+    # Both sheets are fed straight from plain column queries: no ORM objects are built, and the
+    # project rows are fetched in batches while xlsxwriter writes them out.
     categories = (
-        db.query(models.Category)
-        .options(
-            joinedload(models.Category.projects)
-            .joinedload(models.Project.steps)
-            .joinedload(models.Step.subtasks)
-        )
+        db.query(models.Category.id, models.Category.name, func.count(models.Project.id))
+        .outerjoin(models.Category.projects)
+        .group_by(models.Category.id)
         .order_by(models.Category.name)
-        .all()
+    )
+    projects = (
+        db.query(
+            models.Project.id,
+            models.Project.name,
+            models.Project.code,
+            models.Project.status,
+            models.Category.name,
+            models.Project.owner_id,
+            models.Project.start_date,
+            models.Project.target_date,
+            models.Project.progress_percent,
+        )
+        .join(models.Project.category)
+        .order_by(models.Category.name, models.Project.id)
+        .yield_per(_EXPORT_YIELD_PER)
     )
 
-    wb = Workbook()
-    ws_categories = wb.active
-    ws_categories.title = "Categories"
-    ws_categories.append(["ID", "Название", "Проектов"])
-    for category in categories:
-        ws_categories.append([category.id, category.name, len(category.projects)])
-
-    ws_projects = wb.create_sheet("Projects")
-    ws_projects.append(
+    category_rows = chain([["ID", "Название", "Проектов"]], categories)
+    project_rows = chain(
         [
-            "ID",
-            "Название",
-            "Код",
-            "Статус",
-            "Категория",
-            "PM",
-            "Дата старта",
-            "Целевая дата",
-            "Прогресс %",
-        ]
+            [
+                "ID",
+                "Название",
+                "Код",
+                "Статус",
+                "Категория",
+                "PM",
+                "Дата старта",
+                "Целевая дата",
+                "Прогресс %",
+            ]
+        ],
+        projects,
     )
-    for category in categories:
-        for project in category.projects:
-            _apply_progress(project)
-            ws_projects.append(
-                [
-                    project.id,
-                    project.name,
-                    project.code,
-                    project.status,
-                    category.name,
-                    project.owner_id,
-                    project.start_date,
-                    project.target_date,
-                    project.progress_percent,
-                ]
-            )
-
-    return _workbook_response(wb, "categories.xlsx")
+    return _workbook_response({"Categories": category_rows, "Projects": project_rows}, "categories.xlsx")
+
+
+_KPI_COLUMNS = (
+    func.count(models.Project.id),
+    func.sum(case((models.Project.status == schemas.ProjectStatus.ACTIVE.value, 1), else_=0)),
+    func.sum(case((models.Project.status == schemas.ProjectStatus.ARCHIVED.value, 1), else_=0)),
+    func.sum(models.Project.progress_percent),
+    func.sum(models.Project.steps_total),
+    func.sum(models.Project.steps_done),
+    func.sum(models.Project.subtasks_total),
+    func.sum(models.Project.subtasks_done),
+)
 
 
-def _kpi_report(db: Session, category_id: Optional[int] = None) -> schemas.KPIReport:
-    projects_query = db.query(models.Project).options(
-        joinedload(models.Project.steps).joinedload(models.Step.subtasks)
+def _kpi_from_row(total_projects: int, *sums) -> schemas.KPIReport:
+    # SUM over no rows is NULL.
+    active_projects, archived_projects, total_progress, steps_total, steps_done, subtasks_total, subtasks_done = (
+        value or 0 for value in sums
     )
-    if category_id is not None:
-        projects_query = projects_query.filter(models.Project.category_id == category_id)
-    projects = projects_query.all()
-
-    total_projects = len(projects)
-    active_projects = len([p for p in projects if p.status == schemas.ProjectStatus.ACTIVE])
-    archived_projects = len([p for p in projects if p.status == schemas.ProjectStatus.ARCHIVED])
-
-    total_progress = 0
-    steps_total = 0
-    steps_done = 0
-    subtasks_total = 0
-    subtasks_done = 0
-
-    for project in projects:
-        _apply_progress(project)
-        total_progress += project.progress_percent
-        steps_total += project.steps_total
-        steps_done += project.steps_done
-        subtasks_total += project.subtasks_total
-        subtasks_done += project.subtasks_done
-
     average_progress = round(total_progress / total_projects, 2) if total_projects else 0.0
     return schemas.KPIReport(
         total_projects=total_projects,
@@ -466,12 +911,32 @@ def _kpi_report(db: Session, category_id: Optional[int] = None) -> schemas.KPIRe
     )
 
 
+_EMPTY_KPI = _kpi_from_row(0, *(None,) * (len(_KPI_COLUMNS) - 1))
+
+
+def _kpi_report(db: Session, category_id: Optional[int] = None) -> schemas.KPIReport:
+    query = db.query(*_KPI_COLUMNS)
+    if category_id is not None:
+        query = query.filter(models.Project.category_id == category_id)
+    return _kpi_from_row(*query.one())
+
+
+def _category_kpi_reports(db: Session) -> dict[int, schemas.KPIReport]:
+    """KPI reports for every category from one GROUP BY; empty categories get an all-zero report."""
+    rows = (
+        db.query(models.Category.id, *_KPI_COLUMNS)
+        .outerjoin(models.Category.projects)
+        .group_by(models.Category.id)
+    )
+    return {category_id: _kpi_from_row(*values) for category_id, *values in rows}
+
+
 def _export_projects_word(db: Session, category_id: Optional[int] = None) -> StreamingResponse:
     query = (
         db.query(models.Project)
         .options(
             joinedload(models.Project.category),
-            joinedload(models.Project.steps).joinedload(models.Step.subtasks),
+            selectinload(models.Project.steps),
         )
         .order_by(models.Project.start_date.is_(None), models.Project.start_date)
     )
@@ -486,8 +951,10 @@ def _export_projects_word(db: Session, category_id: Optional[int] = None) -> Str
         if category:
             doc.add_paragraph(f"Категория: {category.name}")
 
+    # Assigning style= makes python-docx re-resolve the document's default style on every paragraph;
+    # setting the style id on the paragraph element directly produces the same XML.
+    bullet_style_id = doc.styles["List Bullet"].style_id
     for project in projects:
-        _apply_progress(project)
         doc.add_heading(f"{project.name} ({project.code or 'без кода'})", level=1)
         doc.add_paragraph(f"Статус: {project.status}")
         if project.owner_id:
@@ -500,9 +967,8 @@ def _export_projects_word(db: Session, category_id: Optional[int] = None) -> Str
         if project.steps:
             doc.add_paragraph("Шаги:")
             for step in project.steps:
-                doc.add_paragraph(
-                    f"- {step.name} — {step.status} ({step.progress_percent}% по шагу)", style="List Bullet"
-                )
+                paragraph = doc.add_paragraph(f"- {step.name} — {step.status} ({step.progress_percent}% по шагу)")
+                paragraph._p.style = bullet_style_id
 
     stream = BytesIO()
     doc.save(stream)
@@ -512,7 +978,7 @@ def _export_projects_word(db: Session, category_id: Optional[int] = None) -> Str
 def _export_category_presentation(db: Session, category_id: int) -> StreamingResponse:
     category = (
         db.query(models.Category)
-        .options(joinedload(models.Category.projects).joinedload(models.Project.steps))
+        .options(selectinload(models.Category.projects).selectinload(models.Project.steps))
         .filter(models.Category.id == category_id)
         .first()
     )
@@ -528,7 +994,6 @@ def _export_category_presentation(db: Session, category_id: int) -> StreamingRes
 
     bullet_layout = prs.slide_layouts[1]
     for project in category.projects:
-        _apply_progress(project)
         slide = prs.slides.add_slide(bullet_layout)
         slide.shapes.title.text = project.name
         body = slide.shapes.placeholders[1].text_frame
@@ -539,10 +1004,12 @@ def _export_category_presentation(db: Session, category_id: int) -> StreamingRes
         if project.target_date:
             body.add_paragraph().text = f"Целевая дата: {project.target_date}"
         if project.steps:
-            steps_paragraph = body.add_paragraph("Шаги:")
+            steps_paragraph = body.add_paragraph()
+            steps_paragraph.text = "Шаги:"
             steps_paragraph.level = 0
             for step in project.steps:
-                p = body.add_paragraph(f"• {step.name} — {step.status}")
+                p = body.add_paragraph()
+                p.text = f"• {step.name} — {step.status}"
                 p.level = 1
 
     stream = BytesIO()
@@ -553,40 +1020,47 @@ def _export_category_presentation(db: Session, category_id: int) -> StreamingRes
 def _load_project_with_steps(project_id: int, db: Session) -> models.Project:
     project = (
         db.query(models.Project)
-        .options(joinedload(models.Project.steps).joinedload(models.Step.subtasks))
+        .options(selectinload(models.Project.steps).selectinload(models.Step.subtasks))
         .filter(models.Project.id == project_id)
         .first()
     )
-    if project:
-        _apply_progress(project)
     return project
 
 
 @app.post("/categories", response_model=schemas.Category)
 def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db)):
-    existing = db.query(models.Category).filter(models.Category.name == category.name).first()
-    if existing:
+    stmt = (
+        sqlite_insert(models.Category)
+        .values(name=category.name)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(models.Category)
+    )
+    db_category = db.scalar(stmt)
+    if db_category is None:
         raise HTTPException(status_code=400, detail="Category already exists")
-    db_category = models.Category(name=category.name)
-    db.add(db_category)
     db.commit()
-    db.refresh(db_category)
+    set_committed_value(db_category, "projects", [])
     return db_category
 
 
 @app.get("/categories", response_model=list[schemas.Category])
-def list_categories(db: Session = Depends(get_db)):
+def list_categories(request: Request, db: Session = Depends(get_db)):
+    return _cached_json_response(request, "categories", lambda: _render_categories(db))
+
+
+def _render_categories(db: Session) -> bytes:
     categories = (
         db.query(models.Category)
         .options(
-            joinedload(models.Category.projects)
-            .joinedload(models.Project.steps)
-            .joinedload(models.Step.subtasks)
+            selectinload(models.Category.projects).options(*_PROJECT_DETAIL_LOADS)
         )
         .order_by(models.Category.name)
         .all()
     )
-    return [_apply_category_metrics(category, db) for category in categories]
+    kpis = _category_kpi_reports(db)
+    # The KPI query runs after the category list, so a category committed in between has no row yet.
+    enriched = [_apply_category_metrics(category, kpis.get(category.id, _EMPTY_KPI)) for category in categories]
+    return _CATEGORY_LIST.dump_json(_CATEGORY_LIST.validate_python(enriched, from_attributes=True))
 
 
 @app.get("/export/categories/excel")
@@ -611,83 +1085,107 @@ def kpi_report(category_id: Optional[int] = Query(None), db: Session = Depends(g
 
 @app.post("/pms", response_model=schemas.PM)
 def create_pm(pm: schemas.PMCreate, db: Session = Depends(get_db)):
-    existing = db.query(models.PM).filter(models.PM.name == pm.name).first()
-    if existing:
+    stmt = (
+        sqlite_insert(models.PM)
+        .values(name=pm.name)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(models.PM)
+    )
+    db_pm = db.scalar(stmt)
+    if db_pm is None:
         raise HTTPException(status_code=400, detail="PM already exists")
-    db_pm = models.PM(name=pm.name)
-    db.add(db_pm)
     db.commit()
-    db.refresh(db_pm)
     return db_pm
 
 
 @app.get("/pms", response_model=list[schemas.PM])
-def list_pms(db: Session = Depends(get_db)):
-    return db.query(models.PM).all()
+def list_pms(request: Request, db: Session = Depends(get_db)):
+    return _cached_json_response(
+        request,
+        "pms",
+        lambda: _PM_LIST.dump_json(_PM_LIST.validate_python(db.query(models.PM).all(), from_attributes=True)),
+    )
+
+
+# Everything schemas.Project serializes, loaded up front so the response never lazy-loads per step.
+_PROJECT_DETAIL_LOADS = (
+    selectinload(models.Project.steps).selectinload(models.Step.subtasks),
+    selectinload(models.Project.characteristics),
+    selectinload(models.Project.attachments),
+)
 
 
 @app.post("/projects", response_model=schemas.Project)
 def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
-    db_project = models.Project(**project.dict())
+    # A new project has no children yet: start with empty collections so the response needs no reload.
+    db_project = models.Project(**project.model_dump(), steps=[], characteristics=[], attachments=[])
     db.add(db_project)
     db.commit()
-    db.refresh(db_project)
-    db.refresh(db_project, attribute_names=["steps", "characteristics", "attachments"])
-    return _apply_progress(db_project)
+    return db_project
+
+
+_BULK_INSERT_CHUNK = 1000
+
+
+@app.post("/projects/bulk", response_model=list[schemas.Project])
+def bulk_create_projects(items: list[schemas.ProjectCreate], db: Session = Depends(get_db)):
+    created: list[models.Project] = []
+    for start in range(0, len(items), _BULK_INSERT_CHUNK):
+        chunk = [item.model_dump() for item in items[start : start + _BULK_INSERT_CHUNK]]
+        # SQLite does not promise RETURNING rows in parameter order; have SQLAlchemy match them up.
+        stmt = insert(models.Project).returning(models.Project, sort_by_parameter_order=True)
+        created.extend(db.scalars(stmt, chunk))
+    db.commit()
+    for project in created:
+        for relation in ("steps", "characteristics", "attachments"):
+            set_committed_value(project, relation, [])
+    return created
 
 
 @app.post("/projects/status", response_model=list[schemas.Project])
 def bulk_update_project_status(
     payload: schemas.BulkProjectStatusUpdate, db: Session = Depends(get_db)
 ):
-    projects = (
+    updated = (
         db.query(models.Project)
-        .options(
-            joinedload(models.Project.steps).joinedload(models.Step.subtasks),
-            joinedload(models.Project.characteristics),
-            joinedload(models.Project.attachments),
-        )
         .filter(models.Project.id.in_(payload.ids))
-        .all()
+        .update({"status": payload.status.value}, synchronize_session=False)
     )
-    if not projects:
+    if not updated:
         raise HTTPException(status_code=404, detail="No matching projects found")
-    for project in projects:
-        project.status = payload.status.value
     db.commit()
-    for project in projects:
-        db.refresh(project)
-    return [_apply_progress(project) for project in projects]
+    # Status is not a progress input, so the stored progress stays valid; reload once for the response.
+    return (
+        db.query(models.Project)
+        .options(*_PROJECT_DETAIL_LOADS)
+        .filter(models.Project.id.in_(payload.ids))
+        .order_by(models.Project.id)
+        .all()
+    )
 
 
 @app.patch("/projects/{project_id}", response_model=schemas.Project)
 def update_project(project_id: int, update: schemas.ProjectUpdate, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    fields = update.model_dump(exclude_unset=True)
+    project = _update_returning(db, models.Project, project_id, fields)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    for key, value in update.dict(exclude_unset=True).items():
-        setattr(project, key, value)
+    if fields.keys() & set(_PROGRESS_INPUTS[models.Project]):
+        _refresh_progress(db, [project_id])
     db.commit()
-    db.refresh(project)
-    db.refresh(project, attribute_names=["steps", "characteristics", "attachments"])
-    return _apply_progress(project)
+    return db.get(models.Project, project_id, options=_PROJECT_DETAIL_LOADS, populate_existing=True)
 
 
 @app.get("/projects/{project_id}", response_model=schemas.Project)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    project = (
-        db.query(models.Project)
-        .options(
-            joinedload(models.Project.steps).joinedload(models.Step.subtasks),
-            joinedload(models.Project.characteristics),
-            joinedload(models.Project.attachments),
-        )
-        .filter(models.Project.id == project_id)
-        .first()
+def get_project(project_id: int = PathParam(gt=0), db: Session = Depends(get_db)):
+    project = db.get(
+        models.Project,
+        project_id,
+        options=_PROJECT_DETAIL_LOADS,
     )
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    return _apply_progress(project)
+    return project
 
 
 @app.get("/projects", response_model=list[schemas.Project])
@@ -696,15 +1194,13 @@ def list_projects(
     owner_id: Optional[int] = None,
     status: Optional[schemas.ProjectStatus] = None,
     search: Optional[str] = Query(None, description="Search by name, code, or status"),
+    after_id: Optional[int] = Query(None, description="Page cursor: the id of the last project already received"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit to get every match"),
     db: Session = Depends(get_db),
 ):
     query = (
         db.query(models.Project)
-        .options(
-            joinedload(models.Project.steps).joinedload(models.Step.subtasks),
-            joinedload(models.Project.characteristics),
-            joinedload(models.Project.attachments),
-        )
+        .options(*_PROJECT_DETAIL_LOADS)
         .order_by(models.Project.id)
     )
 
@@ -715,26 +1211,56 @@ def list_projects(
     if status is not None:
         query = query.filter(models.Project.status == status.value)
     if search:
-        like = f"%{search}%"
-        query = query.filter(
-            or_(
-                models.Project.name.ilike(like),
-                models.Project.code.ilike(like),
-                models.Project.status.ilike(like),
-            )
-        )
+        query = query.filter(_project_search_filter(search))
+    # Keyset pagination over the id ordering: each page is an index range scan, however deep.
+    if after_id is not None:
+        query = query.filter(models.Project.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
 
-    projects = query.all()
-    return [_apply_progress(project) for project in projects]
+    return query.all()
+
+
+# Set-based DELETE per table. SQLite does not enforce the foreign keys here, so children are
+# removed explicitly, and callers refresh progress because these statements bypass the flush hooks.
+def _bulk_delete(db: Session, model, condition):
+    return db.execute(delete(model).where(condition).execution_options(synchronize_session=False))
+
+
+def _delete_step_children(db: Session, step_ids) -> None:
+    """Delete what the ORM cascade would remove with the given steps (an id list or a subquery)."""
+    _bulk_delete(db, models.Subtask, models.Subtask.step_id.in_(step_ids))
+    _bulk_delete(db, models.Attachment, models.Attachment.step_id.in_(step_ids))
+
+
+_PROJECT_SEARCH = table(PROJECT_SEARCH_TABLE, column("rowid"), column(PROJECT_SEARCH_TABLE))
+_TRIGRAM = 3
+
+
+def _project_search_filter(search: str):
+    if _project_search_index and len(search) >= _TRIGRAM:
+        # A quoted FTS5 phrase is matched as a literal substring by the trigram tokenizer.
+        phrase = '"' + search.replace('"', '""') + '"'
+        matches = _PROJECT_SEARCH.c[PROJECT_SEARCH_TABLE].op("MATCH")(phrase)
+        return models.Project.id.in_(select(_PROJECT_SEARCH.c.rowid).where(matches))
+    # Too short for a trigram lookup, or no FTS5 in this SQLite build.
+    like = f"%{search}%"
+    return or_(
+        models.Project.name.ilike(like),
+        models.Project.code.ilike(like),
+        models.Project.status.ilike(like),
+    )
 
 
 @app.post("/projects/bulk-delete", status_code=204)
 def bulk_delete_projects(payload: schemas.BulkDeleteRequest, db: Session = Depends(get_db)):
-    projects = db.query(models.Project).filter(models.Project.id.in_(payload.ids)).all()
-    if not projects:
+    step_ids = db.query(models.Step.id).filter(models.Step.project_id.in_(payload.ids)).scalar_subquery()
+    _delete_step_children(db, step_ids)
+    _bulk_delete(db, models.Step, models.Step.project_id.in_(payload.ids))
+    _bulk_delete(db, models.ProjectCharacteristic, models.ProjectCharacteristic.project_id.in_(payload.ids))
+    _bulk_delete(db, models.Attachment, models.Attachment.project_id.in_(payload.ids))
+    if _bulk_delete(db, models.Project, models.Project.id.in_(payload.ids)).rowcount == 0:
         raise HTTPException(status_code=404, detail="No matching projects found")
-    for project in projects:
-        db.delete(project)
     db.commit()
 
 
@@ -748,7 +1274,7 @@ def list_steps(
 ):
     steps = (
         db.query(models.Step)
-        .options(joinedload(models.Step.subtasks))
+        .options(selectinload(models.Step.subtasks))
         .filter(models.Step.project_id == project_id)
         .order_by(models.Step.order_index, models.Step.id)
     )
@@ -760,103 +1286,109 @@ def list_steps(
         like = f"%{search}%"
         steps = steps.filter(or_(models.Step.name.ilike(like), models.Step.description.ilike(like)))
 
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if project is None:
+    result = steps.all()
+    # Rows can only come back for an existing project, so only an empty result needs the 404 check.
+    if not result and not _exists(db, models.Project.id == project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    step_rows = steps.all()
-    for step in step_rows:
-        step.progress_percent = _compute_step_progress(step, project.inprogress_coeff)
-    return step_rows
+    return result
 
 
 @app.post("/steps", response_model=schemas.Step)
 def create_step(step: schemas.StepCreate, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == step.project_id).first()
-    if project is None:
+    if not _exists(db, models.Project.id == step.project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    db_step = models.Step(**step.dict())
+    # A new step has no children: start with empty collections so the response needs no reload.
+    db_step = models.Step(**step.model_dump(), subtasks=[], attachments=[])
     db.add(db_step)
     db.commit()
-    db.refresh(db_step)
-    db.refresh(db_step, attribute_names=["subtasks"])
-    db_step.progress_percent = _compute_step_progress(db_step, project.inprogress_coeff)
     return db_step
 
 
 @app.patch("/steps/{step_id}", response_model=schemas.Step)
 def update_step(step_id: int, update: schemas.StepUpdate, db: Session = Depends(get_db)):
-    step = db.query(models.Step).filter(models.Step.id == step_id).first()
+    fields = update.model_dump(exclude_unset=True)
+    step = _update_returning(db, models.Step, step_id, fields)
     if step is None:
         raise HTTPException(status_code=404, detail="Step not found")
-    for key, value in update.dict(exclude_unset=True).items():
-        setattr(step, key, value)
+    if fields.keys() & set(_PROGRESS_INPUTS[models.Step]):
+        _refresh_progress(db, [step.project_id])
     db.commit()
-    db.refresh(step)
     db.refresh(step, attribute_names=["subtasks"])
-    project = db.query(models.Project).filter(models.Project.id == step.project_id).first()
-    step.progress_percent = _compute_step_progress(step, project.inprogress_coeff)
     return step
 
 
 @app.delete("/steps/{step_id}", status_code=204)
 def delete_step(step_id: int, db: Session = Depends(get_db)):
-    step = db.query(models.Step).filter(models.Step.id == step_id).first()
-    if step is None:
+    _delete_step_children(db, [step_id])
+    project_id = db.scalar(delete(models.Step).where(models.Step.id == step_id).returning(models.Step.project_id))
+    if project_id is None:
         raise HTTPException(status_code=404, detail="Step not found")
-    db.delete(step)
+    _refresh_progress(db, [project_id])
     db.commit()
 
 
 @app.post("/steps/bulk-delete", status_code=204)
 def bulk_delete_steps(payload: schemas.BulkDeleteRequest, db: Session = Depends(get_db)):
-    steps = db.query(models.Step).filter(models.Step.id.in_(payload.ids)).all()
-    if not steps:
+    _delete_step_children(db, payload.ids)
+    project_ids = set(
+        db.scalars(
+            delete(models.Step)
+            .where(models.Step.id.in_(payload.ids))
+            .returning(models.Step.project_id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    if not project_ids:
         raise HTTPException(status_code=404, detail="No matching steps found")
-    for step in steps:
-        db.delete(step)
+    _refresh_progress(db, project_ids)
     db.commit()
 
 
 @app.post("/projects/{project_id}/steps/reorder", response_model=list[schemas.Step])
 def reorder_steps(project_id: int, payload: schemas.OrderUpdate, db: Session = Depends(get_db)):
-    step_ids = payload.ids
-    steps = db.query(models.Step).filter(models.Step.project_id == project_id).all()
-    existing_ids = {step.id for step in steps}
-    if set(step_ids) - existing_ids:
+    order_map = {step_id: index for index, step_id in enumerate(payload.ids)}
+    matched = db.scalar(
+        select(func.count()).where(models.Step.project_id == project_id, models.Step.id.in_(order_map))
+    )
+    if matched != len(order_map):
         raise HTTPException(status_code=400, detail="One or more steps do not belong to the project")
 
-    order_map = {step_id: index for index, step_id in enumerate(step_ids)}
-    for step in steps:
-        if step.id in order_map:
-            step.order_index = order_map[step.id]
-    db.commit()
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    for step in steps:
-        step.progress_percent = _compute_step_progress(step, project.inprogress_coeff)
-    return sorted(steps, key=lambda s: (s.order_index, s.id))
+    if order_map:
+        # One executemany UPDATE keyed by primary key.
+        db.execute(
+            update(models.Step),
+            [{"id": step_id, "order_index": index} for step_id, index in order_map.items()],
+        )
+        db.commit()
+    return (
+        db.query(models.Step)
+        .options(selectinload(models.Step.subtasks))
+        .filter(models.Step.project_id == project_id)
+        .order_by(models.Step.order_index, models.Step.id)
+        .all()
+    )
 
 
 @app.post("/subtasks", response_model=schemas.Subtask)
 def create_subtask(subtask: schemas.SubtaskCreate, db: Session = Depends(get_db)):
-    step = db.query(models.Step).filter(models.Step.id == subtask.step_id).first()
-    if step is None:
+    if not _exists(db, models.Step.id == subtask.step_id):
         raise HTTPException(status_code=404, detail="Step not found")
-    db_subtask = models.Subtask(**subtask.dict())
+    db_subtask = models.Subtask(**subtask.model_dump())
     db.add(db_subtask)
     db.commit()
-    db.refresh(db_subtask)
     return db_subtask
 
 
 @app.patch("/subtasks/{subtask_id}", response_model=schemas.Subtask)
 def update_subtask(subtask_id: int, update: schemas.SubtaskUpdate, db: Session = Depends(get_db)):
-    subtask = db.query(models.Subtask).filter(models.Subtask.id == subtask_id).first()
+    fields = update.model_dump(exclude_unset=True)
+    subtask = _update_returning(db, models.Subtask, subtask_id, fields)
     if subtask is None:
         raise HTTPException(status_code=404, detail="Subtask not found")
-    for key, value in update.dict(exclude_unset=True).items():
-        setattr(subtask, key, value)
+    if fields.keys() & set(_PROGRESS_INPUTS[models.Subtask]):
+        project_id = db.scalar(select(models.Step.project_id).where(models.Step.id == subtask.step_id))
+        _refresh_progress(db, [project_id])
     db.commit()
-    db.refresh(subtask)
     return subtask
 
 
@@ -871,28 +1403,44 @@ def delete_subtask(subtask_id: int, db: Session = Depends(get_db)):
 
 @app.post("/subtasks/bulk-delete", status_code=204)
 def bulk_delete_subtasks(payload: schemas.BulkDeleteRequest, db: Session = Depends(get_db)):
-    subtasks = db.query(models.Subtask).filter(models.Subtask.id.in_(payload.ids)).all()
-    if not subtasks:
+    step_ids = set(
+        db.scalars(
+            delete(models.Subtask)
+            .where(models.Subtask.id.in_(payload.ids))
+            .returning(models.Subtask.step_id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    if not step_ids:
         raise HTTPException(status_code=404, detail="No matching subtasks found")
-    for subtask in subtasks:
-        db.delete(subtask)
+    project_ids = {
+        project_id for (project_id,) in db.query(models.Step.project_id).filter(models.Step.id.in_(step_ids))
+    }
+    _refresh_progress(db, project_ids)
     db.commit()
 
 
 @app.post("/steps/{step_id}/subtasks/reorder", response_model=list[schemas.Subtask])
 def reorder_subtasks(step_id: int, payload: schemas.OrderUpdate, db: Session = Depends(get_db)):
-    subtask_ids = payload.ids
-    subtasks = db.query(models.Subtask).filter(models.Subtask.step_id == step_id).all()
-    existing_ids = {subtask.id for subtask in subtasks}
-    if set(subtask_ids) - existing_ids:
+    order_map = {subtask_id: index for index, subtask_id in enumerate(payload.ids)}
+    matched = db.scalar(
+        select(func.count()).where(models.Subtask.step_id == step_id, models.Subtask.id.in_(order_map))
+    )
+    if matched != len(order_map):
         raise HTTPException(status_code=400, detail="One or more subtasks do not belong to the step")
 
-    order_map = {subtask_id: index for index, subtask_id in enumerate(subtask_ids)}
-    for subtask in subtasks:
-        if subtask.id in order_map:
-            subtask.order_index = order_map[subtask.id]
-    db.commit()
-    return sorted(subtasks, key=lambda s: (s.order_index, s.id))
+    if order_map:
+        db.execute(
+            update(models.Subtask),
+            [{"id": subtask_id, "order_index": index} for subtask_id, index in order_map.items()],
+        )
+        db.commit()
+    return (
+        db.query(models.Subtask)
+        .filter(models.Subtask.step_id == step_id)
+        .order_by(models.Subtask.order_index, models.Subtask.id)
+        .all()
+    )
 
 
 @app.get("/steps/{step_id}/subtasks", response_model=list[schemas.Subtask])
@@ -902,16 +1450,16 @@ def list_subtasks(
     search: Optional[str] = Query(None, description="Search by name"),
     db: Session = Depends(get_db),
 ):
-    step = db.query(models.Step).filter(models.Step.id == step_id).first()
-    if step is None:
-        raise HTTPException(status_code=404, detail="Step not found")
     subtasks = db.query(models.Subtask).filter(models.Subtask.step_id == step_id)
     if status:
         subtasks = subtasks.filter(models.Subtask.status == status.value)
     if search:
         like = f"%{search}%"
         subtasks = subtasks.filter(models.Subtask.name.ilike(like))
-    return subtasks.order_by(models.Subtask.order_index, models.Subtask.id).all()
+    result = subtasks.order_by(models.Subtask.order_index, models.Subtask.id).all()
+    if not result and not _exists(db, models.Step.id == step_id):
+        raise HTTPException(status_code=404, detail="Step not found")
+    return result
 
 
 @app.get("/projects/{project_id}/characteristics", response_model=list[schemas.ProjectCharacteristic])
@@ -920,14 +1468,12 @@ def list_characteristics(project_id: int, db: Session = Depends(get_db)):
 
 
 def _replace_characteristics(project_id: int, items: list[schemas.ProjectCharacteristicBase], db: Session):
-    db.query(models.ProjectCharacteristic).filter(models.ProjectCharacteristic.project_id == project_id).delete()
-    for item in items:
-        db.add(
-            models.ProjectCharacteristic(
-                project_id=project_id,
-                parameter=item.parameter,
-                value=item.value,
-            )
+    _bulk_delete(db, models.ProjectCharacteristic, models.ProjectCharacteristic.project_id == project_id)
+    if items:
+        # One executemany INSERT.
+        db.execute(
+            insert(models.ProjectCharacteristic),
+            [{"project_id": project_id, "parameter": item.parameter, "value": item.value} for item in items],
         )
     db.commit()
     return (
@@ -944,8 +1490,7 @@ def _replace_characteristics(project_id: int, items: list[schemas.ProjectCharact
 def import_characteristics_json(
     project_id: int, payload: schemas.ProjectCharacteristicImport, db: Session = Depends(get_db)
 ):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if project is None:
+    if not _exists(db, models.Project.id == project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     return _replace_characteristics(project_id, payload.items, db)
 
@@ -954,8 +1499,7 @@ def import_characteristics_json(
     "/projects/{project_id}/characteristics/export/json", response_model=list[schemas.ProjectCharacteristic]
 )
 def export_characteristics_json(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if project is None:
+    if not _exists(db, models.Project.id == project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     return (
         db.query(models.ProjectCharacteristic)
@@ -971,26 +1515,27 @@ def export_characteristics_json(project_id: int, db: Session = Depends(get_db)):
 async def import_characteristics_excel(
     project_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)
 ):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if project is None:
+    if not _exists(db, models.Project.id == project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    content = await file.read()
-    workbook = load_workbook(filename=BytesIO(content))
-    sheet = workbook.active
-    items: list[schemas.ProjectCharacteristicBase] = []
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        if not row or not row[0]:
-            continue
-        parameter = str(row[0])
-        value = "" if len(row) < 2 or row[1] is None else str(row[1])
-        items.append(schemas.ProjectCharacteristicBase(parameter=parameter, value=value))
+    # The upload is already spooled to disk past 1 MB; read-only mode parses it from there row by row.
+    workbook = load_workbook(filename=file.file, read_only=True)
+    try:
+        sheet = workbook.active
+        items: list[schemas.ProjectCharacteristicBase] = []
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            if not row or not row[0]:
+                continue
+            parameter = str(row[0])
+            value = "" if len(row) < 2 or row[1] is None else str(row[1])
+            items.append(schemas.ProjectCharacteristicBase(parameter=parameter, value=value))
+    finally:
+        workbook.close()
     return _replace_characteristics(project_id, items, db)
 
 
 @app.get("/projects/{project_id}/characteristics/export/excel")
 def export_characteristics_excel(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if project is None:
+    if not _exists(db, models.Project.id == project_id):
         raise HTTPException(status_code=404, detail="Project not found")
 
     rows = (
@@ -999,26 +1544,21 @@ def export_characteristics_excel(project_id: int, db: Session = Depends(get_db))
         .order_by(models.ProjectCharacteristic.id)
         .all()
     )
-    wb = Workbook()
-    sheet = wb.active
-    sheet.title = "Characteristics"
-    sheet.append(["Параметр", "Значение"])
-    for row in rows:
-        sheet.append([row.parameter, row.value])
-    return _workbook_response(wb, f"project_{project_id}_characteristics.xlsx")
+    sheet_rows = [["Параметр", "Значение"]] + [[row.parameter, row.value] for row in rows]
+    return _workbook_response(
+        {"Characteristics": sheet_rows}, f"project_{project_id}_characteristics.xlsx"
+    )
 
 
 @app.post("/characteristics", response_model=schemas.ProjectCharacteristic)
 def create_characteristic(
     characteristic: schemas.ProjectCharacteristicCreate, db: Session = Depends(get_db)
 ):
-    project = db.query(models.Project).filter(models.Project.id == characteristic.project_id).first()
-    if project is None:
+    if not _exists(db, models.Project.id == characteristic.project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    db_characteristic = models.ProjectCharacteristic(**characteristic.dict())
+    db_characteristic = models.ProjectCharacteristic(**characteristic.model_dump())
     db.add(db_characteristic)
     db.commit()
-    db.refresh(db_characteristic)
     return db_characteristic
 
 
@@ -1026,17 +1566,12 @@ def create_characteristic(
 def update_characteristic(
     characteristic_id: int, update: schemas.ProjectCharacteristicUpdate, db: Session = Depends(get_db)
 ):
-    characteristic = (
-        db.query(models.ProjectCharacteristic)
-        .filter(models.ProjectCharacteristic.id == characteristic_id)
-        .first()
+    characteristic = _update_returning(
+        db, models.ProjectCharacteristic, characteristic_id, update.model_dump(exclude_unset=True)
     )
     if characteristic is None:
         raise HTTPException(status_code=404, detail="Characteristic not found")
-    for key, value in update.dict(exclude_unset=True).items():
-        setattr(characteristic, key, value)
     db.commit()
-    db.refresh(characteristic)
     return characteristic
 
 
@@ -1057,10 +1592,9 @@ def delete_characteristic(characteristic_id: int, db: Session = Depends(get_db))
 def create_attachment(attachment: schemas.AttachmentCreate, db: Session = Depends(get_db)):
     if attachment.project_id is None and attachment.step_id is None:
         raise HTTPException(status_code=400, detail="Attachment must reference a project or step")
-    db_attachment = models.Attachment(**attachment.dict())
+    db_attachment = models.Attachment(**attachment.model_dump())
     db.add(db_attachment)
     db.commit()
-    db.refresh(db_attachment)
     LOGGER.info(
         "Attachment record created: path=%s project_id=%s step_id=%s",
         db_attachment.path,
@@ -1075,26 +1609,34 @@ def _ensure_target_exists(db: Session, project_id: Optional[int], step_id: Optio
         raise HTTPException(status_code=400, detail="Attachment must reference a project or step")
 
     if project_id is not None:
-        exists = db.query(models.Project.id).filter(models.Project.id == project_id).first()
-        if not exists:
+        if not _exists(db, models.Project.id == project_id):
             raise HTTPException(status_code=404, detail="Project not found")
     if step_id is not None:
-        exists = db.query(models.Step.id).filter(models.Step.id == step_id).first()
-        if not exists:
+        if not _exists(db, models.Step.id == step_id):
             raise HTTPException(status_code=404, detail="Step not found")
 
 
-def _persist_file(file: UploadFile, destination: Path) -> Path:
-    original_name = Path(file.filename or "attachment")
-    safe_name = original_name.name
-    target = destination / safe_name
-    counter = 1
-    while target.exists():
-        target = destination / f"{original_name.stem}_{counter}{original_name.suffix}"
-        counter += 1
+def _reserve_upload_path(destination: Path, filename: Optional[str]) -> Path:
+    """Create an empty file for the upload under its original name, or a uuid-suffixed one if taken.
+
+    Exclusive creation makes the reservation atomic across concurrent uploads.
+    """
+    destination.mkdir(parents=True, exist_ok=True)
+    original_name = Path(filename or "attachment")
+    target = destination / original_name.name
+    try:
+        target.open("xb").close()
+    except FileExistsError:
+        target = destination / f"{original_name.stem}_{uuid.uuid4().hex[:12]}{original_name.suffix}"
+        target.open("xb").close()
+    return target
+
 
-    with target.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+async def _persist_file(file: UploadFile, destination: Path) -> Path:
+    target = await anyio.to_thread.run_sync(_reserve_upload_path, destination, file.filename)
+    async with await anyio.open_file(target, "wb") as buffer:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
 
     return target
 
@@ -1108,12 +1650,12 @@ async def upload_attachment(
 ):
     _ensure_target_exists(db, project_id, step_id)
 
-    media_root = _media_root()
+    workspace = get_workspace_path()
+    media_root = workspace / "media"
     target_dir = media_root / f"project_{project_id}" if project_id else media_root / f"step_{step_id}"
-    target_dir.mkdir(parents=True, exist_ok=True)
 
-    stored_file = _persist_file(file, target_dir)
-    relative_path = stored_file.relative_to(get_workspace_path())
+    stored_file = await _persist_file(file, target_dir)
+    relative_path = stored_file.relative_to(workspace)
 
     LOGGER.info(
         "Attachment uploaded: filename=%s stored_as=%s project_id=%s step_id=%s",
@@ -1131,7 +1673,6 @@ async def upload_attachment(
     )
     db.add(db_attachment)
     db.commit()
-    db.refresh(db_attachment)
     return db_attachment
 
 
@@ -1158,34 +1699,34 @@ def delete_attachment(attachment_id: int, db: Session = Depends(get_db)):
     db.commit()
 
 
+def _remove_old_cover(previous: Path) -> None:
+    if previous.exists():
+        try:
+            previous.unlink()
+        except OSError:
+            LOGGER.warning("Failed to remove old cover %s", previous)
+
+
 @app.post("/projects/{project_id}/cover", response_model=schemas.Project)
 async def upload_project_cover(
     project_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)
 ):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    project = db.get(models.Project, project_id, options=_PROJECT_DETAIL_LOADS)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    media_root = _media_root()
-    target_dir = media_root / f"project_{project_id}" / "cover"
-    target_dir.mkdir(parents=True, exist_ok=True)
+    workspace = get_workspace_path()
+    target_dir = workspace / "media" / f"project_{project_id}" / "cover"
 
-    stored_file = _persist_file(file, target_dir)
-    new_relative = stored_file.relative_to(get_workspace_path())
+    stored_file = await _persist_file(file, target_dir)
+    new_relative = stored_file.relative_to(workspace)
 
     if project.cover_image:
-        previous = get_workspace_path() / project.cover_image
-        if previous.exists():
-            try:
-                previous.unlink()
-            except OSError:
-                LOGGER.warning("Failed to remove old cover %s", previous)
+        await anyio.to_thread.run_sync(_remove_old_cover, workspace / project.cover_image)
 
     project.cover_image = str(new_relative)
     db.commit()
-    db.refresh(project)
-    db.refresh(project, attribute_names=["steps", "characteristics", "attachments"])
-    return _apply_progress(project)
+    return project
 
 
 @app.get("/projects/{project_id}/attachments", response_model=list[schemas.Attachment])
@@ -1,4 +1,5 @@
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -21,7 +22,9 @@ def _write_config(data: dict) -> None:
     _CONFIG_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
+@lru_cache(maxsize=1)
 def get_workspace_path() -> Path:
+    # Resolved once per process; set_workspace_path is the only writer of the config and resets it.
     config = _read_config()
     raw_path: Optional[str] = config.get("workspace_path")
     path = Path(raw_path) if raw_path else _DEFAULT_WORKSPACE
@@ -33,5 +36,6 @@ def set_workspace_path(path_str: str) -> Path:
     path = Path(path_str).expanduser().resolve()
     path.mkdir(parents=True, exist_ok=True)
     _write_config({"workspace_path": str(path)})
+    get_workspace_path.cache_clear()
     return path
 
@@ -1,11 +1,112 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.schema import CreateColumn
 
 DATABASE_URL = "sqlite:///./workspace.db"
+POOL_SIZE = 20
+MAX_OVERFLOW = 40
+# Seconds a request waits for a free connection before failing instead of hanging.
+POOL_TIMEOUT = 30
 
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},
+    query_cache_size=1200,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+    # Reuse the most recently returned connection so a small warm set (with its SQLite page cache)
+    # serves most requests; the rest of the pool only opens under bursts.
+    pool_use_lifo=True,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@event.listens_for(engine, "connect")
+def _enable_wal(dbapi_connection, connection_record):
+    # WAL lets readers run alongside a writer instead of waiting on the database lock.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
+
+
+def add_missing_columns() -> list[str]:
+    """Add model columns that an older workspace database does not have yet.
+
+    Run after ``create_all``, which only creates missing tables, never missing columns.
+    Returns the ``table.column`` names that were added.
+    """
+    added = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def add_missing_indexes() -> None:
+    """Create model indexes that an older workspace database does not have yet.
+
+    ``create_all`` only emits indexes together with the tables it creates.
+    """
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+PROJECT_SEARCH_TABLE = "projects_search"
+
+# External-content FTS5 table over the searchable project columns. The trigram tokenizer answers
+# substring queries, like the ILIKE '%term%' fallback; triggers keep it in sync with writes.
+_PROJECT_SEARCH_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {PROJECT_SEARCH_TABLE} USING fts5(
+        name, code, status, content='projects', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {PROJECT_SEARCH_TABLE}_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO {PROJECT_SEARCH_TABLE}(rowid, name, code, status) VALUES (new.id, new.name, new.code, new.status);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {PROJECT_SEARCH_TABLE}_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO {PROJECT_SEARCH_TABLE}({PROJECT_SEARCH_TABLE}, rowid, name, code, status)
+        VALUES ('delete', old.id, old.name, old.code, old.status);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {PROJECT_SEARCH_TABLE}_au AFTER UPDATE OF name, code, status ON projects BEGIN
+        INSERT INTO {PROJECT_SEARCH_TABLE}({PROJECT_SEARCH_TABLE}, rowid, name, code, status)
+        VALUES ('delete', old.id, old.name, old.code, old.status);
+        INSERT INTO {PROJECT_SEARCH_TABLE}(rowid, name, code, status) VALUES (new.id, new.name, new.code, new.status);
+    END""",
+    f"INSERT INTO {PROJECT_SEARCH_TABLE}({PROJECT_SEARCH_TABLE}) VALUES ('rebuild')",
+)
+
+
+def ensure_project_search_index(create: bool = True) -> bool:
+    """Report whether the project search index exists, creating and filling it first if asked.
+
+    Returns False when the SQLite build lacks FTS5 or the trigram tokenizer (SQLite < 3.34);
+    project search then falls back to ILIKE.
+    """
+    with engine.connect() as connection:
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (PROJECT_SEARCH_TABLE,)
+        ).first()
+    if exists is not None or not create:
+        return exists is not None
+    try:
+        with engine.begin() as connection:
+            for statement in _PROJECT_SEARCH_DDL:
+                connection.exec_driver_sql(statement)
+    except OperationalError:
+        return False
+    return True
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -27,11 +27,11 @@ class Project(Base):
     __tablename__ = "projects"
 
     id = Column(Integer, primary_key=True, index=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     code = Column(String, nullable=True)
     status = Column(String, nullable=False, default="active")
-    owner_id = Column(Integer, ForeignKey("pms.id"), nullable=True)
+    owner_id = Column(Integer, ForeignKey("pms.id"), nullable=True, index=True)
     start_date = Column(Date, nullable=True)
     target_date = Column(Date, nullable=True)
     description = Column(Text, nullable=True)
@@ -41,6 +41,12 @@ class Project(Base):
     retail_price = Column(Float, nullable=True)
     cover_image = Column(String, nullable=True)
     media_path = Column(String, nullable=True)
+    # Maintained by the progress hooks in app.py whenever steps or subtasks change.
+    progress_percent = Column(Integer, nullable=False, default=0, server_default="0")
+    steps_total = Column(Integer, nullable=False, default=0, server_default="0")
+    steps_done = Column(Integer, nullable=False, default=0, server_default="0")
+    subtasks_total = Column(Integer, nullable=False, default=0, server_default="0")
+    subtasks_done = Column(Integer, nullable=False, default=0, server_default="0")
 
     category = relationship("Category", back_populates="projects")
     owner = relationship("PM", back_populates="projects")
@@ -53,6 +59,8 @@ class Project(Base):
 
 class Step(Base):
     __tablename__ = "steps"
+    # Steps are always read per project in order_index order; the rowid tail breaks ties by id.
+    __table_args__ = (Index("ix_steps_project_id_order_index", "project_id", "order_index"),)
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -66,6 +74,7 @@ class Step(Base):
     order_index = Column(Integer, nullable=False, default=0)
     weight = Column(Float, nullable=False, default=1.0)
     comments = Column(Text, nullable=True)
+    progress_percent = Column(Integer, nullable=False, default=0, server_default="0")
 
     project = relationship("Project", back_populates="steps")
     assignee = relationship("PM", back_populates="steps")
@@ -75,6 +84,7 @@ class Step(Base):
 
 class Subtask(Base):
     __tablename__ = "subtasks"
+    __table_args__ = (Index("ix_subtasks_step_id_order_index", "step_id", "order_index"),)
 
     id = Column(Integer, primary_key=True, index=True)
     step_id = Column(Integer, ForeignKey("steps.id"), nullable=False)
@@ -94,7 +104,7 @@ class ProjectCharacteristic(Base):
     __tablename__ = "project_characteristics"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
     parameter = Column(String, nullable=False)
     value = Column(String, nullable=True)
 
@@ -105,8 +115,8 @@ class Attachment(Base):
     __tablename__ = "attachments"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
-    step_id = Column(Integer, ForeignKey("steps.id"), nullable=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True, index=True)
+    step_id = Column(Integer, ForeignKey("steps.id"), nullable=True, index=True)
     path = Column(String, nullable=False)
     added_at = Column(Date, nullable=True)
 
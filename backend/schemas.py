@@ -283,3 +283,9 @@ class UpdateManifest(BaseModel):
         description="Optional SHA-256 checksum (hex) of the referenced installer",
         pattern=r"^[a-fA-F0-9]{64}$",
     )
+
+
+class UpdatePackageInfo(BaseModel):
+    filename: str
+    url: str
+    sha256: str
@@ -0,0 +1,45 @@
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend import config, database
+from backend.app import _invalidate_lookup_cache, app
+
+_APP_ENGINE = database.engine
+
+
+@pytest.fixture
+def workspace_engine(tmp_path, monkeypatch):
+    """Point the app at a fresh ``workspace.db`` under ``tmp_path`` instead of the real workspace."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'workspace.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr("backend.app.engine", engine)
+    database.SessionLocal.configure(bind=engine)
+    # The lookup cache is process-wide; bodies cached from another test's database must not leak in.
+    _invalidate_lookup_cache(None)
+    yield engine
+    database.SessionLocal.configure(bind=_APP_ENGINE)
+    engine.dispose()
+
+
+@pytest.fixture
+def client(workspace_engine):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Switch the workspace folder (media, cache, updates) to a fresh directory under ``tmp_path``."""
+    monkeypatch.setattr(config, "_CONFIG_PATH", tmp_path / "workspace_config.json")
+    path = config.set_workspace_path(str(tmp_path / "workspace"))
+    yield path
+    # Forget the test workspace; the next call reads the real config again once the patch is undone.
+    config.get_workspace_path.cache_clear()
@@ -0,0 +1,70 @@
+import os
+
+
+def test_update_manifest_revalidation(client, workspace):
+    client.post("/updates/manifest", json={"version": "1.0.0", "notes": "первый"})
+
+    first = client.get("/updates/manifest")
+    assert first.status_code == 200
+    assert first.json()["version"] == "1.0.0"
+    etag = first.headers["etag"]
+
+    not_modified = client.get("/updates/manifest", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    client.post("/updates/manifest", json={"version": "1.1.0", "notes": "второй"})
+
+    changed = client.get("/updates/manifest", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["version"] == "1.1.0"
+    assert changed.headers["etag"] != etag
+
+
+def test_update_package_download_revalidation(client, workspace):
+    client.post("/updates/package", files={"file": ("pkg.bin", b"v1")})
+
+    first = client.get("/updates/download/pkg.bin")
+    assert first.status_code == 200
+    assert first.content == b"v1"
+    etag = first.headers["etag"]
+
+    assert client.get("/updates/download/pkg.bin", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/updates/package", files={"file": ("pkg.bin", b"v2 build")})
+
+    changed = client.get("/updates/download/pkg.bin", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.content == b"v2 build"
+
+
+def _write_later(path, data):
+    # A newer mtime than the previous version even on filesystems with coarse timestamps.
+    stat_result = path.stat()
+    path.write_bytes(data)
+    os.utime(path, (stat_result.st_atime + 10, stat_result.st_mtime + 10))
+
+
+def test_workspace_file_revalidation(client, workspace):
+    media = workspace / "media"
+    media.mkdir(exist_ok=True)
+    (media / "note.txt").write_bytes(b"first")
+
+    first = client.get("/files/media/note.txt")
+    assert first.status_code == 200
+    assert first.content == b"first"
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    by_etag = client.get("/files/media/note.txt", headers={"If-None-Match": etag})
+    assert by_etag.status_code == 304
+    assert by_etag.headers["cache-control"] == "no-cache"
+    by_date = client.get("/files/media/note.txt", headers={"If-Modified-Since": last_modified})
+    assert by_date.status_code == 304
+
+    _write_later(media / "note.txt", b"second")
+
+    for headers in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        changed = client.get("/files/media/note.txt", headers=headers)
+        assert changed.status_code == 200
+        assert changed.content == b"second"
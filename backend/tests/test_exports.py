@@ -0,0 +1,112 @@
+from datetime import datetime
+from io import BytesIO
+
+from openpyxl import load_workbook
+from pptx import Presentation
+
+
+def _workbook(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    return load_workbook(BytesIO(response.content))
+
+
+def _rows(sheet):
+    return [list(row) for row in sheet.iter_rows(values_only=True)]
+
+
+def test_categories_excel_export(client):
+    beta = client.post("/categories", json={"name": "Beta"}).json()["id"]
+    alpha = client.post("/categories", json={"name": "Alpha"}).json()["id"]
+    empty = client.post("/categories", json={"name": "Empty"}).json()["id"]
+    pm = client.post("/pms", json={"name": "PM"}).json()["id"]
+    second = client.post("/projects", json={"name": "Second", "category_id": beta}).json()["id"]
+    dated = client.post(
+        "/projects",
+        json={
+            "name": "Dated",
+            "code": "D-1",
+            "category_id": alpha,
+            "owner_id": pm,
+            "start_date": "2026-01-05",
+            "target_date": "2026-03-31",
+        },
+    ).json()["id"]
+    third = client.post("/projects", json={"name": "Third", "category_id": beta, "status": "archived"}).json()["id"]
+    step = client.post("/steps", json={"project_id": second, "name": "Step"}).json()
+    client.patch(f"/steps/{step['id']}", json={"status": "in_progress"})
+
+    workbook = _workbook(client.get("/export/categories/excel"))
+
+    assert workbook.sheetnames == ["Categories", "Projects"]
+    # Categories by name, including one without projects.
+    assert _rows(workbook["Categories"]) == [
+        ["ID", "Название", "Проектов"],
+        [alpha, "Alpha", 1],
+        [beta, "Beta", 2],
+        [empty, "Empty", 0],
+    ]
+    projects = workbook["Projects"]
+    assert _rows(projects) == [
+        ["ID", "Название", "Код", "Статус", "Категория", "PM", "Дата старта", "Целевая дата", "Прогресс %"],
+        [dated, "Dated", "D-1", "active", "Alpha", pm, datetime(2026, 1, 5), datetime(2026, 3, 31), 0],
+        [second, "Second", None, "active", "Beta", None, None, None, 50],
+        [third, "Third", None, "archived", "Beta", None, None, None, 0],
+    ]
+    assert projects["G2"].number_format == "yyyy-mm-dd"
+    assert projects["H2"].number_format == "yyyy-mm-dd"
+
+
+def test_categories_excel_export_of_empty_workspace(client):
+    workbook = _workbook(client.get("/export/categories/excel"))
+
+    assert _rows(workbook["Categories"]) == [["ID", "Название", "Проектов"]]
+    assert len(_rows(workbook["Projects"])) == 1
+
+
+def test_characteristics_excel_export(client):
+    category = client.post("/categories", json={"name": "Cat"}).json()["id"]
+    project = client.post("/projects", json={"name": "P", "category_id": category}).json()["id"]
+    bare = client.post("/projects", json={"name": "Bare", "category_id": category}).json()["id"]
+    for parameter, value in (("Цвет", "Красный"), ("Вес", None), ("Объём", "20 л")):
+        client.post("/characteristics", json={"project_id": project, "parameter": parameter, "value": value})
+
+    response = client.get(f"/projects/{project}/characteristics/export/excel")
+
+    workbook = _workbook(response)
+    assert f"project_{project}_characteristics.xlsx" in response.headers["content-disposition"]
+    assert workbook.sheetnames == ["Characteristics"]
+    assert _rows(workbook["Characteristics"]) == [
+        ["Параметр", "Значение"],
+        ["Цвет", "Красный"],
+        ["Вес", None],
+        ["Объём", "20 л"],
+    ]
+    assert _rows(_workbook(client.get(f"/projects/{bare}/characteristics/export/excel"))["Characteristics"]) == [
+        ["Параметр", "Значение"]
+    ]
+    assert client.get("/projects/999/characteristics/export/excel").status_code == 404
+
+
+def test_category_presentation_export(client):
+    category = client.post("/categories", json={"name": "Cat"}).json()["id"]
+    project = client.post(
+        "/projects", json={"name": "Slides", "code": "S-1", "category_id": category, "target_date": "2026-06-01"}
+    ).json()["id"]
+    client.post("/steps", json={"project_id": project, "name": "Design", "status": "done"})
+    client.post("/projects", json={"name": "No steps", "category_id": category})
+
+    response = client.get(f"/export/category/{category}/presentation")
+
+    assert response.status_code == 200
+    presentation = Presentation(BytesIO(response.content))
+    slides = [
+        [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame] for slide in presentation.slides
+    ]
+    assert slides[0] == ["Категория: Cat", "Презентация проектов"]
+    assert [texts[0] for texts in slides[1:]] == ["Slides", "No steps"]
+    body = slides[1][1].splitlines()
+    assert body[0] == "Код: S-1"
+    assert "Целевая дата: 2026-06-01" in body
+    assert body[-2:] == ["Шаги:", "• Design — done"]
+    assert client.get("/export/category/999/presentation").status_code == 404
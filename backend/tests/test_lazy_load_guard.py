@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, selectinload
+
+from backend import models
+from backend.app import _raise_on_lazy_load
+
+
+@pytest.fixture
+def guarded_session():
+    engine = create_engine("sqlite:///:memory:")
+    models.Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.add(
+            models.Project(
+                id=1,
+                category_id=1,
+                name="Guarded",
+                steps=[models.Step(name="One", subtasks=[models.Subtask(name="a")])],
+            )
+        )
+        session.commit()
+        session.expunge_all()
+        event.listen(session, "do_orm_execute", _raise_on_lazy_load)
+        yield session
+
+
+def test_lazy_relationship_load_raises(guarded_session):
+    project = guarded_session.get(models.Project, 1)
+
+    with pytest.raises(InvalidRequestError, match="Lazy load from Project"):
+        project.steps
+
+
+def test_eager_loads_pass(guarded_session):
+    project = guarded_session.get(
+        models.Project, 1, options=[selectinload(models.Project.steps).selectinload(models.Step.subtasks)]
+    )
+
+    assert [subtask.name for step in project.steps for subtask in step.subtasks] == ["a"]
+
+
+def test_refresh_passes(guarded_session):
+    project = guarded_session.get(models.Project, 1)
+
+    guarded_session.refresh(project)
+    guarded_session.refresh(project, ["steps"])
+
+    assert [step.name for step in project.steps] == ["One"]
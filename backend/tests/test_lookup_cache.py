@@ -0,0 +1,59 @@
+from backend.app import _accepts_gzip, _cached_lookup
+
+
+def test_cached_lookup_reuses_value_within_ttl():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return str(len(calls)).encode()
+
+    first = _cached_lookup("test-reuse", loader)
+    assert _cached_lookup("test-reuse", loader) is first
+    assert len(calls) == 1
+
+
+def test_commit_through_api_invalidates_cached_lookup(client):
+    first = client.get("/pms")
+    assert first.json() == []
+    etag = first.headers["etag"]
+
+    assert client.get("/pms", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/pms", json={"name": "Alice"})
+
+    second = client.get("/pms", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert [pm["name"] for pm in second.json()] == ["Alice"]
+    assert second.headers["etag"] != etag
+
+
+def test_conditional_get_accepts_weak_and_listed_etags(client):
+    etag = client.get("/categories").headers["etag"]
+
+    assert client.get("/categories", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/categories", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get("/categories", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_accept_encoding_q_values():
+    assert _accepts_gzip("gzip, deflate, br")
+    assert _accepts_gzip("deflate, GZIP;q=0.5")
+    assert _accepts_gzip("*")
+    assert not _accepts_gzip("")
+    assert not _accepts_gzip("gzip;q=0")
+    assert not _accepts_gzip("gzip; q=0.000, identity")
+    assert not _accepts_gzip("*;q=0")
+    assert not _accepts_gzip("gzip;q=0, *")
+    assert not _accepts_gzip("br, deflate")
+    assert not _accepts_gzip("gzip;level=1;q=0")
+
+
+def test_refused_gzip_gets_identity_body(client):
+    for index in range(30):
+        client.post("/pms", json={"name": f"Project manager {index}"})
+
+    assert client.get("/pms", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+    refused = client.get("/pms", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in refused.headers
+    assert len(refused.json()) == 30
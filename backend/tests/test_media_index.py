@@ -0,0 +1,129 @@
+from pathlib import Path
+import os
+import shutil
+import sys
+import threading
+import time
+
+from backend.app import _build_thumbnails, _list_media_dir, _media_dir_index
+
+
+# Well past the filesystem timestamp resolution, as for a directory untouched for a while.
+_SETTLED_MTIME = time.time() - 60
+
+
+def _settle(*paths: Path) -> None:
+    for path in paths:
+        os.utime(path, (_SETTLED_MTIME, _SETTLED_MTIME))
+
+
+def test_media_listing_follows_changes_within_mtime_resolution(tmp_path):
+    nested = tmp_path / "project_1" / "cover"
+    nested.mkdir(parents=True)
+    (tmp_path / "project_1" / "a.JPG").write_bytes(b"")
+    (tmp_path / "project_1" / "notes.txt").write_bytes(b"")
+
+    root = str(tmp_path)
+    assert _list_media_dir(root) == [tmp_path / "project_1" / "a.JPG"]
+
+    # Written right after the listing, possibly within the same mtime tick.
+    (nested / "cover.png").write_bytes(b"")
+    assert sorted(_list_media_dir(root)) == [tmp_path / "project_1" / "a.JPG", nested / "cover.png"]
+
+    (tmp_path / "project_1" / "a.JPG").unlink()
+    assert _list_media_dir(root) == [nested / "cover.png"]
+
+
+def test_media_listing_reuses_settled_directories(tmp_path):
+    project = tmp_path / "project_1"
+    project.mkdir()
+    (project / "a.jpg").write_bytes(b"")
+    _settle(project, tmp_path)
+
+    assert _list_media_dir(str(tmp_path)) == [project / "a.jpg"]
+    assert str(project) in _media_dir_index
+
+    # Same mtime as the cached listing, so the directory is not scanned again.
+    (project / "b.jpg").write_bytes(b"")
+    _settle(project)
+    assert _list_media_dir(str(tmp_path)) == [project / "a.jpg"]
+
+
+def test_media_listing_forgets_removed_subdirectories(tmp_path):
+    nested = tmp_path / "project_1" / "cover"
+    nested.mkdir(parents=True)
+    (nested / "cover.png").write_bytes(b"")
+    _settle(nested, nested.parent, tmp_path)
+
+    assert _list_media_dir(str(tmp_path)) == [nested / "cover.png"]
+    assert {str(nested), str(nested.parent)} <= _media_dir_index.keys()
+
+    shutil.rmtree(nested.parent)
+    assert _list_media_dir(str(tmp_path)) == []
+    assert str(nested) not in _media_dir_index
+    assert str(nested.parent) not in _media_dir_index
+
+
+def test_media_listing_is_safe_across_threads(tmp_path):
+    projects = []
+    for index in range(100):
+        project = tmp_path / f"project_{index}"
+        (project / "cover").mkdir(parents=True)
+        _settle(project / "cover", project)
+        projects.append(project)
+    _settle(tmp_path)
+    errors = []
+
+    def walk():
+        try:
+            for _ in range(100):
+                _list_media_dir(str(tmp_path))
+        except Exception as exc:  # collected so the main thread can fail the test
+            errors.append(exc)
+
+    def churn():
+        # Removed and recreated subdirectories make listings rebuild and evict while others read.
+        try:
+            for round_ in range(200):
+                project = projects[round_ % len(projects)]
+                shutil.rmtree(project)
+                (project / "cover").mkdir(parents=True)
+                # Settled, but each round at a new mtime so the cached listings are replaced.
+                settled = _SETTLED_MTIME + round_ + 1
+                for path in (project / "cover", project, tmp_path):
+                    os.utime(path, (settled, settled))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=walk) for _ in range(7)] + [threading.Thread(target=churn)]
+    # Switch threads as often as possible so readers and writers interleave inside the index loops.
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+    assert errors == []
+
+
+def test_thumbnail_sources_sharing_a_destination_are_built_once(workspace):
+    from PIL import Image
+
+    media = workspace / "media" / "project_1"
+    media.mkdir(parents=True)
+    for index, suffix in enumerate((".jpg", ".jpeg", ".bmp", ".webp", ".png")):
+        Image.new("RGB", (64, 64), (index * 50, 0, 0)).save(media / f"a{suffix}")
+
+    result = _build_thumbnails()
+
+    thumb_dir = workspace / "cache" / "thumbnails" / "media" / "project_1"
+    thumbnails = sorted(path.name for path in thumb_dir.iterdir())
+    assert thumbnails == ["a.jpg", "a.png"]
+    assert result["processed"] == 5
+    assert (result["created"], result["skipped"], result["failures"]) == (2, 3, [])
+    with Image.open(thumb_dir / "a.jpg") as thumbnail:
+        thumbnail.load()
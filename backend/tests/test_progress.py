@@ -4,12 +4,15 @@ from sqlalchemy.orm import sessionmaker
 from pathlib import Path
 import sys
 
+from fastapi.testclient import TestClient
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from backend import models
-from backend.app import _apply_progress, _compute_step_progress, _kpi_report
+from backend.database import SessionLocal
+from backend.app import _apply_progress, _compute_step_progress, _kpi_report, app
 
 
 def make_session():
@@ -108,3 +111,300 @@ def test_kpi_report_uses_weighted_progress():
     assert report.subtasks_total == 2
     assert report.subtasks_done == 1
     assert report.average_progress > 0
+
+
+def test_kpi_report_matches_per_project_progress():
+    session = make_session()
+    projects = [
+        models.Project(id=1, category_id=1, name="Empty", status="active", inprogress_coeff=0.5),
+        models.Project(
+            id=2,
+            category_id=1,
+            name="Mixed",
+            status="archived",
+            inprogress_coeff=0.3,
+            steps=[
+                models.Step(id=10, project_id=2, name="No subtasks", status="in_progress", weight=1),
+                models.Step(
+                    id=11,
+                    project_id=2,
+                    name="Weighted",
+                    status="todo",
+                    weight=3,
+                    subtasks=[
+                        models.Subtask(step_id=11, name="a", status="done", weight=2),
+                        models.Subtask(step_id=11, name="b", status="in_progress", weight=1),
+                        models.Subtask(step_id=11, name="c", status="blocked", weight=1),
+                    ],
+                ),
+            ],
+        ),
+        models.Project(
+            id=3,
+            category_id=2,
+            name="Zero weights",
+            status="active",
+            inprogress_coeff=0.5,
+            steps=[
+                models.Step(id=20, project_id=3, name="Done", status="done", weight=0),
+                models.Step(
+                    id=21,
+                    project_id=3,
+                    name="Weightless subtasks",
+                    status="done",
+                    weight=0,
+                    subtasks=[models.Subtask(step_id=21, name="z", status="done", weight=0)],
+                ),
+            ],
+        ),
+    ]
+    session.add_all(projects)
+    session.commit()
+
+    for category_id in (None, 1, 2):
+        selected = [p for p in projects if category_id is None or p.category_id == category_id]
+        enriched = [_apply_progress(p) for p in selected]
+        report = _kpi_report(session, category_id)
+
+        assert report.total_projects == len(selected)
+        assert report.active_projects == len([p for p in selected if p.status == "active"])
+        assert report.archived_projects == len([p for p in selected if p.status == "archived"])
+        assert report.average_progress == round(
+            sum(p.progress_percent for p in enriched) / len(enriched), 2
+        )
+        assert report.steps_total == sum(p.steps_total for p in enriched)
+        assert report.steps_done == sum(p.steps_done for p in enriched)
+        assert report.subtasks_total == sum(p.subtasks_total for p in enriched)
+        assert report.subtasks_done == sum(p.subtasks_done for p in enriched)
+
+
+def test_stored_progress_follows_subtask_and_coeff_changes():
+    session = make_session()
+    subtask = models.Subtask(name="Only", status="todo", weight=1)
+    project = models.Project(
+        category_id=1,
+        name="Stored",
+        inprogress_coeff=0.5,
+        steps=[models.Step(name="Step", status="todo", weight=1, subtasks=[subtask])],
+    )
+    session.add(project)
+    session.commit()
+    assert project.progress_percent == 0
+
+    subtask.status = "in_progress"
+    session.commit()
+    session.expire_all()
+    assert project.progress_percent == 50
+    assert project.steps[0].progress_percent == 50
+
+    project.inprogress_coeff = 0.2
+    session.commit()
+    session.expire_all()
+    assert project.progress_percent == 20
+
+    session.delete(subtask)
+    session.commit()
+    session.expire_all()
+    # Without subtasks the step falls back to its own status.
+    assert project.progress_percent == 0
+    assert project.subtasks_total == 0
+
+
+def test_startup_backfills_progress_of_older_databases(workspace_engine, monkeypatch):
+    # A workspace from before the stored progress columns: same tables, none of those columns.
+    models.Base.metadata.create_all(bind=workspace_engine)
+    with workspace_engine.begin() as connection:
+        for name in ("progress_percent", "steps_total", "steps_done", "subtasks_total", "subtasks_done"):
+            connection.exec_driver_sql(f"ALTER TABLE projects DROP COLUMN {name}")
+        connection.exec_driver_sql("ALTER TABLE steps DROP COLUMN progress_percent")
+        connection.exec_driver_sql("INSERT INTO categories (id, name) VALUES (1, 'Legacy')")
+        connection.exec_driver_sql(
+            "INSERT INTO projects (id, category_id, name, status, inprogress_coeff) VALUES "
+            "(1, 1, 'Mixed', 'active', 0.5), (2, 1, 'Empty', 'active', 0.5), (3, 1, 'Low coeff', 'active', 0.2)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO steps (id, project_id, name, status, order_index, weight) VALUES "
+            "(1, 1, 'Heavy', 'done', 0, 2), (2, 1, 'Light', 'todo', 1, 1), (3, 3, 'Only', 'todo', 0, 1)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO subtasks (step_id, name, status, order_index, weight) VALUES "
+            "(2, 'a', 'done', 0, 1), (2, 'b', 'in_progress', 1, 3), (3, 'c', 'in_progress', 0, 1)"
+        )
+
+    # Smaller than the project count, so the backfill has to walk more than one batch.
+    monkeypatch.setattr("backend.app._BACKFILL_BATCH_SIZE", 2)
+    with TestClient(app) as client:
+        projects = {project["id"]: project for project in client.get("/projects").json()}
+        steps = client.get("/projects/1/steps").json()
+
+    # Heavy=100 (w=2), Light=(1*1 + 0.5*3)/4=62.5 -> 62 (w=1) => (200+62)/3=87.3 -> 87
+    assert [step["progress_percent"] for step in steps] == [100, 62]
+    assert projects[1]["progress_percent"] == 87
+    assert (projects[1]["steps_total"], projects[1]["steps_done"]) == (2, 1)
+    assert (projects[1]["subtasks_total"], projects[1]["subtasks_done"]) == (2, 1)
+    assert projects[2]["progress_percent"] == 0 and projects[2]["steps_total"] == 0
+    assert projects[3]["progress_percent"] == 20
+    assert (projects[3]["subtasks_total"], projects[3]["subtasks_done"]) == (1, 0)
+
+
+def _seed_project(client, name="Seeded"):
+    """Project with a done step and a step whose subtasks are half finished, as in the KPI tests."""
+    categories = client.get("/categories").json()
+    category = categories[0] if categories else client.post("/categories", json={"name": "Cat"}).json()
+    project = client.post("/projects", json={"name": name, "category_id": category["id"]}).json()
+    heavy = client.post("/steps", json={"project_id": project["id"], "name": "Heavy", "status": "done", "weight": 2}).json()
+    light = client.post("/steps", json={"project_id": project["id"], "name": "Light", "weight": 1}).json()
+    done = client.post("/subtasks", json={"step_id": light["id"], "name": "a", "status": "done", "weight": 1}).json()
+    started = client.post(
+        "/subtasks", json={"step_id": light["id"], "name": "b", "status": "in_progress", "weight": 3}
+    ).json()
+    client.post("/attachments", json={"path": "media/step.txt", "step_id": light["id"]})
+    client.post("/attachments", json={"path": "media/project.txt", "project_id": project["id"]})
+    client.post("/characteristics", json={"project_id": project["id"], "parameter": "Colour", "value": "Red"})
+    return {"project": project["id"], "heavy": heavy["id"], "light": light["id"], "done": done["id"], "started": started["id"]}
+
+
+def _stored_progress(client, project_id):
+    project = client.get(f"/projects/{project_id}").json()
+    return {
+        name: project[name]
+        for name in ("progress_percent", "steps_total", "steps_done", "subtasks_total", "subtasks_done")
+    }
+
+
+def _row_counts(**conditions):
+    with SessionLocal() as db:
+        return {name: db.query(model).filter(condition).count() for name, (model, condition) in conditions.items()}
+
+
+def test_seeded_project_progress(client):
+    ids = _seed_project(client)
+
+    # Heavy=100 (w=2), Light=(1*1 + 0.5*3)/4=62.5 -> 62 (w=1) => (200+62)/3=87.3 -> 87
+    assert _stored_progress(client, ids["project"]) == {
+        "progress_percent": 87, "steps_total": 2, "steps_done": 1, "subtasks_total": 2, "subtasks_done": 1,
+    }
+
+
+def test_bulk_delete_subtasks_refreshes_progress(client):
+    ids = _seed_project(client)
+
+    assert client.post("/subtasks/bulk-delete", json={"ids": [ids["started"]]}).status_code == 204
+
+    assert [subtask["id"] for subtask in client.get(f"/steps/{ids['light']}/subtasks").json()] == [ids["done"]]
+    # Light is down to its done subtask: 100% => project 100%.
+    assert _stored_progress(client, ids["project"]) == {
+        "progress_percent": 100, "steps_total": 2, "steps_done": 2, "subtasks_total": 1, "subtasks_done": 1,
+    }
+
+
+def test_delete_step_removes_children_and_refreshes_progress(client):
+    ids = _seed_project(client)
+
+    assert client.delete(f"/steps/{ids['light']}").status_code == 204
+
+    assert _row_counts(
+        subtasks=(models.Subtask, models.Subtask.step_id == ids["light"]),
+        attachments=(models.Attachment, models.Attachment.step_id == ids["light"]),
+    ) == {"subtasks": 0, "attachments": 0}
+    assert _stored_progress(client, ids["project"]) == {
+        "progress_percent": 100, "steps_total": 1, "steps_done": 1, "subtasks_total": 0, "subtasks_done": 0,
+    }
+
+
+def test_bulk_delete_steps_removes_children_and_refreshes_progress(client):
+    ids = _seed_project(client)
+    other = _seed_project(client, name="Other")
+
+    assert client.post("/steps/bulk-delete", json={"ids": [ids["heavy"], other["light"]]}).status_code == 204
+
+    assert _row_counts(
+        subtasks=(models.Subtask, models.Subtask.step_id == other["light"]),
+        attachments=(models.Attachment, models.Attachment.step_id == other["light"]),
+    ) == {"subtasks": 0, "attachments": 0}
+    # Only Light (62%) is left in the first project, only Heavy (done) in the other.
+    assert _stored_progress(client, ids["project"]) == {
+        "progress_percent": 62, "steps_total": 1, "steps_done": 0, "subtasks_total": 2, "subtasks_done": 1,
+    }
+    assert _stored_progress(client, other["project"]) == {
+        "progress_percent": 100, "steps_total": 1, "steps_done": 1, "subtasks_total": 0, "subtasks_done": 0,
+    }
+
+
+def test_bulk_delete_projects_removes_children(client):
+    ids = _seed_project(client)
+    kept = _seed_project(client, name="Kept")
+
+    assert client.post("/projects/bulk-delete", json={"ids": [ids["project"]]}).status_code == 204
+
+    assert client.get(f"/projects/{ids['project']}").status_code == 404
+    counts = _row_counts(
+        steps=(models.Step, models.Step.project_id == ids["project"]),
+        subtasks=(models.Subtask, models.Subtask.step_id.in_([ids["heavy"], ids["light"]])),
+        characteristics=(models.ProjectCharacteristic, models.ProjectCharacteristic.project_id == ids["project"]),
+        attachments=(
+            models.Attachment,
+            (models.Attachment.project_id == ids["project"]) | (models.Attachment.step_id == ids["light"]),
+        ),
+    )
+    assert counts == {"steps": 0, "subtasks": 0, "characteristics": 0, "attachments": 0}
+    assert _stored_progress(client, kept["project"])["progress_percent"] == 87
+    assert len(client.get(f"/projects/{kept['project']}/attachments").json()) == 1
+
+
+def test_patching_subtask_status_and_weight_refreshes_progress(client):
+    ids = _seed_project(client)
+
+    client.patch(f"/subtasks/{ids['started']}", json={"weight": 1})
+    # Light=(1 + 0.5)/2=75 => (200+75)/3=91.7 -> 92
+    assert _stored_progress(client, ids["project"])["progress_percent"] == 92
+
+    client.patch(f"/subtasks/{ids['started']}", json={"status": "done"})
+    assert _stored_progress(client, ids["project"]) == {
+        "progress_percent": 100, "steps_total": 2, "steps_done": 2, "subtasks_total": 2, "subtasks_done": 2,
+    }
+
+
+def test_patching_step_status_and_weight_refreshes_progress(client):
+    ids = _seed_project(client)
+
+    client.patch(f"/steps/{ids['heavy']}", json={"status": "todo"})
+    # Heavy=0 (w=2), Light=62 (w=1) => 62/3=20.7 -> 21
+    assert _stored_progress(client, ids["project"]) == {
+        "progress_percent": 21, "steps_total": 2, "steps_done": 0, "subtasks_total": 2, "subtasks_done": 1,
+    }
+
+    client.patch(f"/steps/{ids['light']}", json={"weight": 3})
+    # 62*3/5=37.2 -> 37
+    assert _stored_progress(client, ids["project"])["progress_percent"] == 37
+    assert client.get(f"/projects/{ids['project']}/steps").json()[1]["progress_percent"] == 62
+
+
+def test_patching_project_coeff_refreshes_progress(client):
+    ids = _seed_project(client)
+
+    response = client.patch(f"/projects/{ids['project']}", json={"inprogress_coeff": 0.0})
+    # Light=1/4=25 => (200+25)/3=75
+    assert response.json()["progress_percent"] == 75
+    assert _stored_progress(client, ids["project"]) == {
+        "progress_percent": 75, "steps_total": 2, "steps_done": 1, "subtasks_total": 2, "subtasks_done": 1,
+    }
+    assert client.get(f"/projects/{ids['project']}/steps").json()[1]["progress_percent"] == 25
+
+    # Edits that do not feed into progress leave it as it is.
+    client.patch(f"/projects/{ids['project']}", json={"name": "Renamed"})
+    assert _stored_progress(client, ids["project"])["progress_percent"] == 75
+
+
+def test_category_created_between_list_and_kpi_queries_gets_empty_kpi(client, monkeypatch):
+    client.post("/categories", json={"name": "Late"})
+    # As if the category was committed after the KPI GROUP BY had already run.
+    monkeypatch.setattr("backend.app._category_kpi_reports", lambda db: {})
+
+    response = client.get("/categories")
+
+    assert response.status_code == 200
+    (category,) = response.json()
+    assert category["kpi"]["total_projects"] == 0
+    assert category["kpi"]["average_progress"] == 0
+    assert category["progress_percent"] == 0
@@ -0,0 +1,62 @@
+import backend.app
+from backend.database import PROJECT_SEARCH_TABLE
+
+
+def _create_projects(client, *projects):
+    category = client.post("/categories", json={"name": "Search"}).json()
+    return [client.post("/projects", json={**project, "category_id": category["id"]}).json()["id"] for project in projects]
+
+
+def _search(client, term):
+    return [project["id"] for project in client.get("/projects", params={"search": term}).json()]
+
+
+def _index_matches(engine, term):
+    """Rowids the FTS index itself returns, without the join back to ``projects``."""
+    with engine.connect() as connection:
+        return [
+            rowid
+            for (rowid,) in connection.exec_driver_sql(
+                f"SELECT rowid FROM {PROJECT_SEARCH_TABLE} WHERE {PROJECT_SEARCH_TABLE} MATCH ?", (f'"{term}"',)
+            )
+        ]
+
+
+def test_search_index_follows_rename(client):
+    assert backend.app._project_search_index
+    (widget,) = _create_projects(client, {"name": "Alpha Widget", "code": "AW-100"})
+    assert _search(client, "widget") == [widget]
+
+    client.patch(f"/projects/{widget}", json={"name": "Beta Gadget"})
+
+    assert _search(client, "widget") == []
+    assert _search(client, "GADGET") == [widget]
+    assert _search(client, "aw-1") == [widget]
+
+
+def test_search_index_follows_status_change(client):
+    kept, archived = _create_projects(client, {"name": "Kept"}, {"name": "Shelved"})
+
+    client.post("/projects/status", json={"ids": [archived], "status": "archived"})
+
+    assert _search(client, "archived") == [archived]
+    assert _search(client, "active") == [kept]
+
+
+def test_search_index_follows_delete(client, workspace_engine):
+    kept, deleted = _create_projects(client, {"name": "Kept lamp"}, {"name": "Deleted lamp"})
+    assert sorted(_index_matches(workspace_engine, "lamp")) == [kept, deleted]
+
+    client.post("/projects/bulk-delete", json={"ids": [deleted]})
+
+    assert _index_matches(workspace_engine, "lamp") == [kept]
+    assert _search(client, "lamp") == [kept]
+
+
+def test_short_search_falls_back_to_substring_match(client):
+    oven, fridge = _create_projects(client, {"name": "Oven", "code": "OV"}, {"name": "Fridge", "code": "FR-2"})
+
+    # Shorter than a trigram: matched with ILIKE instead of the FTS index.
+    assert _search(client, "ov") == [oven]
+    assert _search(client, "2") == [fridge]
+    assert _search(client, "e") == [oven, fridge]
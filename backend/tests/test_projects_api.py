@@ -0,0 +1,144 @@
+def _category(client, name="Cat"):
+    return client.post("/categories", json={"name": name}).json()["id"]
+
+
+def test_bulk_create_returns_projects_in_request_order(client, monkeypatch):
+    # Smaller than the batch, so the request spans several INSERT chunks.
+    monkeypatch.setattr("backend.app._BULK_INSERT_CHUNK", 3)
+    category_id = _category(client)
+    items = [{"name": f"Bulk {index}", "code": f"B-{index}", "category_id": category_id} for index in range(8)]
+
+    response = client.post("/projects/bulk", json=items)
+
+    assert response.status_code == 200
+    created = response.json()
+    assert [(project["name"], project["code"]) for project in created] == [(item["name"], item["code"]) for item in items]
+    assert len({project["id"] for project in created}) == len(items)
+    for project in created:
+        stored = client.get(f"/projects/{project['id']}").json()
+        assert (stored["name"], stored["code"]) == (project["name"], project["code"])
+        assert stored["steps"] == [] and stored["progress_percent"] == 0
+
+
+def test_bulk_create_with_no_items(client):
+    response = client.post("/projects/bulk", json=[])
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert client.get("/projects").json() == []
+
+
+def _project_with_steps(client, category_id, name, count):
+    project = client.post("/projects", json={"name": name, "category_id": category_id}).json()["id"]
+    steps = [
+        client.post("/steps", json={"project_id": project, "name": f"{name} {index}", "order_index": index}).json()["id"]
+        for index in range(count)
+    ]
+    return project, steps
+
+
+def _step_order(client, project):
+    return [step["id"] for step in client.get(f"/projects/{project}/steps").json()]
+
+
+def test_reorder_steps_returns_new_order(client):
+    project, (first, second, third) = _project_with_steps(client, _category(client), "P", 3)
+
+    response = client.post(f"/projects/{project}/steps/reorder", json={"ids": [third, first, second]})
+
+    assert response.status_code == 200
+    assert [step["id"] for step in response.json()] == [third, first, second]
+    assert [step["order_index"] for step in response.json()] == [0, 1, 2]
+    assert _step_order(client, project) == [third, first, second]
+
+
+def test_reorder_steps_rejects_foreign_and_unknown_ids(client):
+    category_id = _category(client)
+    project, steps = _project_with_steps(client, category_id, "P", 2)
+    _, (foreign,) = _project_with_steps(client, category_id, "Other", 1)
+
+    for ids in ([steps[1], foreign], [steps[1], 9999]):
+        response = client.post(f"/projects/{project}/steps/reorder", json={"ids": ids})
+        assert response.status_code == 400
+    assert _step_order(client, project) == steps
+
+
+def test_reorder_steps_with_duplicate_and_omitted_ids(client):
+    project, (first, second, third) = _project_with_steps(client, _category(client), "P", 3)
+
+    # A repeated id takes its last position; steps left out keep their order_index.
+    response = client.post(f"/projects/{project}/steps/reorder", json={"ids": [second, first, second]})
+
+    assert response.status_code == 200
+    assert {step["id"]: step["order_index"] for step in response.json()} == {first: 1, second: 2, third: 2}
+    assert [step["id"] for step in response.json()] == [first, second, third]
+
+
+def test_reorder_subtasks(client):
+    category_id = _category(client)
+    _, (step, other_step) = _project_with_steps(client, category_id, "P", 2)
+    first, second, third = (
+        client.post("/subtasks", json={"step_id": step, "name": name, "order_index": index}).json()["id"]
+        for index, name in enumerate("abc")
+    )
+    foreign = client.post("/subtasks", json={"step_id": other_step, "name": "x"}).json()["id"]
+
+    response = client.post(f"/steps/{step}/subtasks/reorder", json={"ids": [third, second, first]})
+    assert response.status_code == 200
+    assert [subtask["id"] for subtask in response.json()] == [third, second, first]
+    assert [subtask["id"] for subtask in client.get(f"/steps/{step}/subtasks").json()] == [third, second, first]
+
+    for ids in ([first, foreign], [first, 9999]):
+        assert client.post(f"/steps/{step}/subtasks/reorder", json={"ids": ids}).status_code == 400
+
+    response = client.post(f"/steps/{step}/subtasks/reorder", json={"ids": [first, first, second]})
+    assert response.status_code == 200
+    assert {subtask["id"]: subtask["order_index"] for subtask in response.json()} == {first: 1, second: 2, third: 0}
+
+
+def _pages(client, limit, **params):
+    pages, after_id = [], None
+    while True:
+        query = {**params, "limit": limit} if after_id is None else {**params, "limit": limit, "after_id": after_id}
+        page = [project["id"] for project in client.get("/projects", params=query).json()]
+        if not page:
+            return pages
+        pages.append(page)
+        after_id = page[-1]
+
+
+def test_keyset_pagination_over_projects(client):
+    lamps = _category(client, "Lamps")
+    ovens = _category(client, "Ovens")
+    created = client.post(
+        "/projects/bulk",
+        json=[
+            {"name": f"{'Lamp' if index % 2 else 'Oven'} {index}", "category_id": lamps if index % 3 else ovens}
+            for index in range(11)
+        ],
+    ).json()
+    everything = [project["id"] for project in client.get("/projects").json()]
+    assert len(everything) == 11
+
+    pages = _pages(client, 4)
+    assert [len(page) for page in pages] == [4, 4, 3]
+    assert [project_id for page in pages for project_id in page] == everything
+
+    in_lamps = [project["id"] for project in created if project["category_id"] == lamps]
+    pages = _pages(client, 3, category_id=lamps)
+    assert len(pages) > 1
+    assert [project_id for page in pages for project_id in page] == in_lamps
+
+    lamp_named = [project["id"] for project in created if project["name"].startswith("Lamp")]
+    pages = _pages(client, 2, search="lamp")
+    assert len(pages) > 1
+    assert [project_id for page in pages for project_id in page] == lamp_named
+
+    both = [project_id for project_id in lamp_named if project_id in in_lamps]
+    assert [project_id for page in _pages(client, 1, search="lamp", category_id=lamps) for project_id in page] == both
+
+
+def test_pagination_limit_bounds(client):
+    assert client.get("/projects", params={"limit": 0}).status_code == 422
+    assert client.get("/projects", params={"limit": 501}).status_code == 422
+    assert client.get("/projects", params={"limit": 500, "after_id": 10**6}).json() == []